@@ -0,0 +1,551 @@
+import os
+
+import numpy as np
+
+from sgp4.api import jday
+
+from catalog import catalog_tles, init_satrecs
+from epochs import datetime_components, jday_from_epochs, jday_from_grid
+
+BACKENDS = {}
+
+# Arguments of sgp4init after the satellite number, with the epoch split
+SGP4INIT_FIELDS = (
+    "jdsatepoch",
+    "jdsatepochF",
+    "bstar",
+    "ndot",
+    "nddot",
+    "ecco",
+    "argpo",
+    "inclo",
+    "mo",
+    "no_kozai",
+    "nodeo",
+)
+
+
+# Outputs of the propagations besides the errors: positions and velocities
+STATE_FIELDS = ("r", "v")
+
+
+def register(cls):
+    BACKENDS[cls.name] = cls()
+    return cls
+
+
+def copy_into(out, result):
+    """Copy the ``(e, r, v)`` ``result`` of a propagation into ``out``.
+
+    For the callers that need the results in their own arrays, like
+    `Backend.propagate_into`. The positions or velocities that are None
+    in ``result`` are returned as None. Returns the ``out`` arrays, with
+    ``e = None`` if either error array is None.
+
+    """
+    e, r, v = result
+    out_e, out_r, out_v = out
+    if r is not None:
+        out_r[...] = r
+    if v is not None:
+        out_v[...] = v
+    out_r = out_r if r is not None else None
+    out_v = out_v if v is not None else None
+    if e is None or out_e is None:
+        return None, out_r, out_v
+
+    # Per satellite errors broadcast to every date
+    out_e[...] = np.reshape(e, np.shape(e) + (1,) * (out_e.ndim - np.ndim(e)))
+    return out_e, out_r, out_v
+
+
+class Backend:
+    """Adapter between one propagator API and the benchmark scenarios.
+
+    Only the ``propagate_*`` hooks run under the benchmark timer:
+    ``load``, ``build``, ``build_catalog``, ``times``, ``grid_times``, ``pack``,
+    the ``prepare_*`` hooks and ``teardown`` don't. Every ``propagate_*``
+    hook returns ``(e, r, v)``, with ``e = None`` for the backends without
+    ``error_codes``, whose APIs don't report them.
+
+    ``propagate_grid`` propagates to the regular grid of dates
+    ``start + step * arange(count)``. Backends that can't compute the times
+    since epoch on the fly propagate the dates of `epochs.jday_from_grid`.
+
+    ``propagate_many`` and ``propagate_grid`` also accept ``out``,
+    preallocated ``(e, r, v)`` arrays of shapes ``(n, m)``, ``(n, m, 3)``
+    and ``(n, m, 3)``, and return them filled in place. ``e`` may be None.
+    Only ``writes_out`` backends accept them, and only ``strided_out`` ones
+    accept strided views into bigger buffers; the others reject them with
+    a ValueError rather than copying their results. `propagate_into` also
+    copies the results of the other backends into ``out``.
+
+    They also accept ``fields``, the `STATE_FIELDS` to compute, and return
+    None instead of the others (whose ``out`` arrays may be None too).
+    Only ``selects_fields`` backends accept a subset of them; the others,
+    whose API always computes and allocates both, reject it with
+    a ValueError.
+
+    Satellites failing at a date get NaN positions and velocities there.
+    Backends without ``deep_space`` support reject deep space satellites
+    with a ValueError. ``rtol`` is the tolerance of the backend against the
+    reference implementation, and ``deep_space_rtol`` its tolerance on deep
+    space satellites.
+
+    ``slow_scenarios`` are marked as slow, together with their variants
+    (like ``multiple_satellites_multiple_dates_large_sharded``).
+    ``jit_compiled`` backends compile their code on the first call,
+    and ``jit_cached`` ones cache it on disk in ``NUMBA_CACHE_DIR``.
+
+    """
+
+    name = None
+    rtol = 1e-7
+    slow_scenarios = frozenset()
+    jit_compiled = False
+    jit_cached = False
+    error_codes = True
+    writes_out = False
+    strided_out = False
+    selects_fields = False
+    deep_space = True
+    deep_space_rtol = 1e-7
+
+    def load(self):
+        pass
+
+    def build(self, tles):
+        raise NotImplementedError
+
+    def build_catalog(self, catalog):
+        """Build the satellites of a `catalog.parse_catalog` catalog."""
+        return self.build(catalog_tles(catalog))
+
+    def prepare_single(self, satellite, epoch):
+        return (satellite, *jday(*datetime_components(epoch)))
+
+    def times(self, epochs):
+        return jday_from_epochs(epochs)
+
+    def pack(self, satellites):
+        return satellites
+
+    def prepare_array(self, satellite, epochs):
+        return (satellite, *self.times(epochs))
+
+    def prepare_many(self, satellites, epochs):
+        return (self.pack(satellites), *self.times(epochs))
+
+    def grid_times(self, start, step, count):
+        return jday_from_grid(start, step, count)
+
+    def prepare_grid(self, satellites, start, step, count):
+        return (self.pack(satellites), *self.grid_times(start, step, count))
+
+    def propagate_single(self, satellite, jd, fr):
+        return satellite.sgp4(jd, fr)
+
+    def propagate_array(self, satellite, jd, fr):
+        return satellite.sgp4_array(jd, fr)
+
+    def propagate_many(self, satellites, jd, fr, out=None, fields=STATE_FIELDS):
+        raise NotImplementedError
+
+    def propagate_grid(self, satellites, *times, out=None, fields=STATE_FIELDS):
+        return self.propagate_many(satellites, *times, out=out, fields=fields)
+
+    def propagate_into(self, satellites, *times, out):
+        """`propagate_many` into C-contiguous ``out``, even if it can't write into it."""
+        if self.writes_out:
+            return self.propagate_many(satellites, *times, out=out)
+        return copy_into(out, self.propagate_many(satellites, *times))
+
+    def _check_outputs(self, out, fields):
+        if out is not None and not self.writes_out:
+            raise ValueError("{} can't write into output arrays".format(self.name))
+        if tuple(fields) != STATE_FIELDS and not self.selects_fields:
+            raise ValueError("{} always computes r and v".format(self.name))
+
+    def restore(self, records):
+        """Pack the satellites of `cache.SatrecCache` records, without building them."""
+        raise NotImplementedError
+
+    def set_threads(self, threads):
+        """Limit a multithreaded backend to ``threads``, or its default if None."""
+        raise NotImplementedError
+
+    def teardown(self, args):
+        pass
+
+
+@register
+class PurePythonBackend(Backend):
+    name = "pure_python"
+    slow_scenarios = frozenset({"multiple_satellites_multiple_dates_large"})
+
+    def load(self):
+        from sgp4.model import Satrec, SatrecArray, WGS72
+        from cache import restore_satrecs
+
+        self.Satrec, self.SatrecArray, self.WGS72 = Satrec, SatrecArray, WGS72
+        self.restore_satrecs = restore_satrecs
+
+    def build(self, tles):
+        return [self.Satrec.twoline2rv(*tle, self.WGS72) for tle in tles]
+
+    def build_catalog(self, catalog):
+        return init_satrecs(catalog, self.Satrec, self.WGS72)
+
+    def pack(self, satellites):
+        return self.SatrecArray(satellites)
+
+    def restore(self, records):
+        return self.pack(self.restore_satrecs(records, self.Satrec))
+
+    def propagate_many(self, satrec_array, jd, fr, out=None, fields=STATE_FIELDS):
+        self._check_outputs(out, fields)
+        return satrec_array.sgp4(jd, fr)
+
+
+@register
+class CPPWrapperBackend(PurePythonBackend):
+    name = "cpp_wrapper"
+    slow_scenarios = frozenset()
+    writes_out = True
+
+    def load(self):
+        from sgp4.model import WGS72
+        from sgp4.wrapper import Satrec, SatrecArray
+
+        self.Satrec, self.SatrecArray, self.WGS72 = Satrec, SatrecArray, WGS72
+
+    def restore(self, records):
+        # The C++ Satrec attributes are read-only,
+        # so only the parsing of the TLEs is skipped
+        if "satnum_str" in records.dtype.names:
+            # Alpha-5 satellite numbers, since sgp4 2.22
+            from sgp4.alpha5 import from_alpha5
+
+            satnums = [
+                from_alpha5(satnum_str)
+                for satnum_str in np.char.decode(records["satnum_str"], "ascii")
+            ]
+        else:
+            satnums = records["satnum"].tolist()
+
+        satellites = []
+        for satnum, jdsatepoch, jdsatepochF, *elements in zip(
+            satnums, *(records[name].tolist() for name in SGP4INIT_FIELDS)
+        ):
+            satellite = self.Satrec()
+            satellite.sgp4init(
+                self.WGS72,
+                "i",
+                satnum,
+                jdsatepoch - 2433281.5 + jdsatepochF,
+                *elements,
+            )
+            satellites.append(satellite)
+
+        return self.pack(satellites)
+
+    def propagate_many(self, satrec_array, jd, fr, out=None, fields=STATE_FIELDS):
+        if out is None:
+            return super().propagate_many(satrec_array, jd, fr, out, fields)
+
+        self._check_outputs(out, fields)
+
+        # The extension only writes into C-contiguous arrays of its dtypes,
+        # and always writes both positions and velocities
+        e, r, v = out
+        if e is None:
+            e = np.empty(r.shape[:2], dtype=np.uint8)
+        if not all(
+            array is not None
+            and array.dtype == dtype
+            and array.flags.c_contiguous
+            and array.flags.writeable
+            for array, dtype in zip((e, r, v), (np.uint8, np.float64, np.float64))
+        ):
+            raise ValueError(
+                "cpp_wrapper only writes into C-contiguous uint8 and float64 arrays"
+            )
+
+        satrec_array._sgp4(
+            jd.astype(np.float64, copy=False),
+            fr.astype(np.float64, copy=False),
+            e,
+            r,
+            v,
+        )
+        return out[0], r, v
+
+
+@register
+class NumbaBackend(Backend):
+    name = "numba"
+    jit_compiled = True
+
+    def load(self):
+        from numba.typed import List
+        from sgp4.model import WGS72
+        from sgp4.fast.model import Satrec, sgp4_array, sgp4_many, twoline2rv
+
+        self.List, self.WGS72 = List, WGS72
+        self.Satrec, self.twoline2rv = Satrec, twoline2rv
+        self.sgp4_array, self.sgp4_many = sgp4_array, sgp4_many
+
+    def build(self, tles):
+        return [self.twoline2rv(self.Satrec(), *tle, self.WGS72) for tle in tles]
+
+    def pack(self, satellites):
+        return self.List(satellites)
+
+    def propagate_array(self, satellite, jd, fr):
+        return self.sgp4_array(satellite, jd, fr)
+
+    def propagate_many(self, satellites, jd, fr, out=None, fields=STATE_FIELDS):
+        self._check_outputs(out, fields)
+        return self.sgp4_many(satellites, jd, fr)
+
+
+@register
+class CythonBackend(Backend):
+    name = "cython"
+    rtol = 1e-6  # Default rtol=1e-7 makes test fail
+    deep_space_rtol = 1e-5  # Independent implementation of the deep space terms
+    error_codes = False
+    selects_fields = True
+
+    def load(self):
+        from cysgp4 import PyTle, Satellite, PyDateTime, propagate_many, set_num_threads
+
+        self.PyTle, self.Satellite, self.PyDateTime = PyTle, Satellite, PyDateTime
+        self.cysgp4_propagate_many = propagate_many
+        self.set_num_threads = set_num_threads
+
+    def build(self, tles):
+        return [self.PyTle("_", line1, line2) for (line1, line2) in tles]
+
+    def times(self, epochs):
+        jd, fr = jday_from_epochs(epochs)
+        return ((jd - 2400000.5) + fr,)
+
+    def grid_times(self, start, step, count):
+        jd, fr = jday_from_grid(start, step, count)
+        return ((jd - 2400000.5) + fr,)
+
+    def pack(self, tles):
+        return np.array(tles)[..., None]
+
+    def prepare_single(self, tle, epoch):
+        return (self.Satellite(tle, None, self.PyDateTime(epoch)),)
+
+    def prepare_array(self, tle, epochs):
+        return (np.array([tle]), *self.times(epochs))
+
+    def propagate_single(self, sat):
+        p = sat.eci_pos()
+        return None, p.loc, p.vel
+
+    def propagate_array(self, tles, mjds, fields=STATE_FIELDS):
+        frames = {}
+        if tuple(fields) != STATE_FIELDS:
+            # Only the selected ECI output, without the other frames, while
+            # the full state keeps the defaults of the baseline benchmarks
+            frames = dict(
+                do_eci_pos="r" in fields,
+                do_eci_vel="v" in fields,
+                do_geo=False,
+                do_topo=False,
+                do_obs_pos=False,
+                do_sat_azel=False,
+            )
+        result = self.cysgp4_propagate_many(
+            mjds, tles, on_error="coerce_to_nan", **frames
+        )
+        r, v = result.get("eci_pos"), result.get("eci_vel")
+        # cysgp4 leaves some components of the failed velocities finite
+        for state in (r, v):
+            if state is not None:
+                state[np.isnan(state).any(axis=-1)] = np.nan
+        return None, r, v
+
+    def propagate_many(self, tles, mjds, out=None, fields=STATE_FIELDS):
+        self._check_outputs(out, fields)
+        return self.propagate_array(tles, mjds, fields)
+
+    def set_threads(self, threads):
+        self.set_num_threads(threads or os.cpu_count())
+
+
+@register
+class NumpyVectorizedBackend(Backend):
+    name = "numpy_vectorized"
+    rtol = 1e-5  # Default rtol=1e-7 makes test fail
+    writes_out = True
+    strided_out = True
+    selects_fields = True
+
+    def load(self):
+        from sgp4_vec.io import twoline2rv
+        from sgp4_vec.model import minutes_per_day
+        from sgp4_vec.ext import jday
+        from sgp4_vec.propagation import sgp4
+        from sgp4_vec.earth_gravity import wgs72
+
+        self.twoline2rv, self.wgs72 = twoline2rv, wgs72
+        self.minutes_per_day, self.jday, self.sgp4 = minutes_per_day, jday, sgp4
+
+    def build(self, tles):
+        return [self.twoline2rv(*tle, self.wgs72) for tle in tles]
+
+    def times(self, epochs):
+        return (np.array([self.jday(*datetime_components(epoch)) for epoch in epochs]),)
+
+    def grid_times(self, start, step, count):
+        jd, fr = jday_from_grid(start, step, count)
+        return (jd + fr,)
+
+    def prepare_single(self, satellite, epoch):
+        return (satellite, *datetime_components(epoch))
+
+    def propagate_single(self, satellite, *components):
+        r, v = satellite.propagate(*components)
+        return satellite.error, r, v
+
+    def propagate_array(self, satellite, jd):
+        (rx, ry, rz), (vx, vy, vz) = self.sgp4(
+            satellite, (jd - satellite.jdsatepoch) * self.minutes_per_day
+        )
+        return satellite.error, np.array([rx, ry, rz]).T, np.array([vx, vy, vz]).T
+
+    def propagate_many(self, satellites, jd, out=None, fields=STATE_FIELDS):
+        e, r, v = (None, None, None) if out is None else out
+        r, v = self.numpy_sgp4_many(satellites, jd, r_array=r, v_array=v, fields=fields)
+        errors = np.array([satellite.error for satellite in satellites])
+        if e is None:
+            return errors, r, v
+
+        e[...] = errors[:, None]
+        return e, r, v
+
+    # Custom function, not present in the original implementation
+    def numpy_sgp4_many(
+        self,
+        satellites,
+        jd,
+        whichconst=None,
+        r_array=None,
+        v_array=None,
+        fields=STATE_FIELDS,
+    ):
+        n = len(satellites)
+        m = len(jd)
+
+        if r_array is None and "r" in fields:
+            r_array = np.empty((n, m, 3))
+        if v_array is None and "v" in fields:
+            v_array = np.empty((n, m, 3))
+
+        for ii in range(n):
+            satellite = satellites[ii]
+
+            (rx, ry, rz), (vx, vy, vz) = self.sgp4(
+                satellite,
+                (jd - satellite.jdsatepoch) * self.minutes_per_day,
+                whichconst,
+            )
+            # Component by component, without (3, m) temporaries
+            if r_array is not None:
+                r_array[ii, :, 0] = rx
+                r_array[ii, :, 1] = ry
+                r_array[ii, :, 2] = rz
+            if v_array is not None:
+                v_array[ii, :, 0] = vx
+                v_array[ii, :, 1] = vy
+                v_array[ii, :, 2] = vz
+
+        return r_array, v_array
+
+
+@register
+class NumpyBroadcastBackend(Backend):
+    name = "numpy_broadcast"
+    deep_space = False
+    writes_out = True
+    strided_out = True
+    selects_fields = True
+
+    def load(self):
+        from sgp4.model import Satrec, WGS72
+        from broadcast import SatelliteArrays, sgp4_broadcast, sgp4_grid
+
+        self.Satrec, self.WGS72 = Satrec, WGS72
+        self.SatelliteArrays, self.sgp4_broadcast = SatelliteArrays, sgp4_broadcast
+        self.sgp4_grid = sgp4_grid
+
+    def build(self, tles):
+        return [self.Satrec.twoline2rv(*tle, self.WGS72) for tle in tles]
+
+    def build_catalog(self, catalog):
+        return init_satrecs(catalog, self.Satrec, self.WGS72)
+
+    def pack(self, satellites):
+        return self.SatelliteArrays.from_satrecs(satellites)
+
+    def restore(self, records):
+        return self.SatelliteArrays.from_records(records)
+
+    def prepare_single(self, satellite, epoch):
+        jd, fr = jday(*datetime_components(epoch))
+        return (self.pack([satellite]), np.array([jd]), np.array([fr]))
+
+    def prepare_array(self, satellite, epochs):
+        return (self.pack([satellite]), *self.times(epochs))
+
+    def propagate_single(self, satellites, jd, fr):
+        e, r, v = self.sgp4_broadcast(satellites, jd, fr)
+        return e[0, 0], tuple(r[0, 0]), tuple(v[0, 0])
+
+    def propagate_array(self, satellites, jd, fr):
+        e, r, v = self.sgp4_broadcast(satellites, jd, fr)
+        return e[0], r[0], v[0]
+
+    def propagate_many(self, satellites, jd, fr, out=None, fields=STATE_FIELDS):
+        return self.sgp4_broadcast(satellites, jd, fr, out=out, fields=fields)
+
+    def grid_times(self, start, step, count):
+        # Only the first date, and the step in minutes
+        (jd,), (fr,) = jday_from_grid(start, step, 1)
+        return jd, fr, np.timedelta64(step, "us") / np.timedelta64(1, "m"), count
+
+    def propagate_grid(
+        self, satellites, jd, fr, step, count, out=None, fields=STATE_FIELDS
+    ):
+        return self.sgp4_grid(satellites, jd, fr, step, count, out=out, fields=fields)
+
+
+@register
+class NumbaParallelBackend(NumpyBroadcastBackend):
+    name = "numba_parallel"
+    jit_compiled = True
+    jit_cached = True
+
+    def load(self):
+        import numba
+        from parallel import elements, sgp4_parallel, sgp4_parallel_grid
+
+        super().load()
+        self.numba = numba
+        self.elements, self.sgp4_broadcast = elements, sgp4_parallel
+        self.sgp4_grid = sgp4_parallel_grid
+
+    def pack(self, satellites):
+        return self.elements(super().pack(satellites))
+
+    def restore(self, records):
+        return self.elements(super().restore(records))
+
+    def set_threads(self, threads):
+        self.numba.set_num_threads(threads or self.numba.config.NUMBA_NUM_THREADS)
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import numpy as np
+
+
+class MicroBatcher:
+    """Asyncio front end gathering single propagation requests into batches.
+
+    Every `propagate` call requests one satellite (an index into
+    ``satellites``, built by ``backend``) at one epoch. The first request
+    of a batch waits at most ``window`` seconds for others, and the batch is
+    propagated as soon as it has ``max_batch`` requests. The requests of a
+    batch are grouped by epoch, and the requested satellites of every epoch
+    are propagated with one ``propagate_many`` call, so that requests for
+    the current position of many satellites cost one call per batch.
+
+    Batches are propagated in the event loop, like a single worker.
+    Use it as an asynchronous context manager to start and stop it.
+
+    """
+
+    def __init__(self, backend, satellites, window=0.001, max_batch=1024):
+        self.backend = backend
+        self.satellites = satellites
+        self.window = window
+        self.max_batch = max_batch
+        self.batch_sizes = []
+
+    async def __aenter__(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.ensure_future(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+    async def propagate(self, satellite, epoch):
+        """``(e, r, v)`` of the satellite of index ``satellite`` at ``epoch``."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((satellite, epoch, future))
+        return await future
+
+    async def _gather(self):
+        loop = asyncio.get_running_loop()
+        requests = [await self._queue.get()]
+        deadline = loop.time() + self.window
+        while len(requests) < self.max_batch:
+            if not self._queue.empty():
+                requests.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                requests.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return requests
+
+    async def _run(self):
+        while True:
+            requests = await self._gather()
+            self.batch_sizes.append(len(requests))
+            try:
+                results = self._propagate_batch(requests)
+            except Exception as error:
+                for _, _, future in requests:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            for (_, _, future), result in zip(requests, results):
+                # Clients cancelled while waiting don't get their results
+                if not future.done():
+                    future.set_result(result)
+
+    def _propagate_batch(self, requests):
+        # Positions in the batch of the requests of every epoch
+        by_epoch = {}
+        for position, (_, epoch, _) in enumerate(requests):
+            by_epoch.setdefault(epoch, []).append(position)
+
+        results = [None] * len(requests)
+        for epoch, positions in by_epoch.items():
+            # Satellites requested several times are propagated once
+            rows = {}
+            for position in positions:
+                rows.setdefault(requests[position][0], len(rows))
+            batch = self.backend.pack([self.satellites[index] for index in rows])
+            e, r, v = self.backend.propagate_many(batch, *self.backend.times([epoch]))
+            r, v = np.asarray(r), np.asarray(v)
+            if e is not None:
+                # Per satellite errors for the backends that only report those
+                e = np.asarray(e).reshape(len(rows), -1)[:, 0]
+
+            for position in positions:
+                row = rows[requests[position][0]]
+                results[position] = (
+                    None if e is None else e[row],
+                    r[row, 0],
+                    v[row, 0],
+                )
+
+        return results
+
+
+async def run_load(batcher, requests, concurrency):
+    """Send ``requests`` from ``concurrency`` concurrent clients.
+
+    Every client sends the next ``(satellite, epoch)`` of ``requests``
+    as soon as its previous one is answered, like a closed loop load
+    generator. Returns the latency (s) of every request.
+
+    """
+    latencies = np.empty(len(requests))
+    pending = iter(enumerate(requests))
+
+    async def client():
+        for index, (satellite, epoch) in pending:
+            start = time.perf_counter()
+            await batcher.propagate(satellite, epoch)
+            latencies[index] = time.perf_counter() - start
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies
+
+
+def serve_load(backend, satellites, requests, concurrency, window, max_batch=1024):
+    """Run `run_load` on a new `MicroBatcher` in a new event loop.
+
+    Returns the latencies of the requests and the sizes of the batches.
+
+    """
+
+    async def serve():
+        async with MicroBatcher(backend, satellites, window, max_batch) as batcher:
+            latencies = await run_load(batcher, requests, concurrency)
+        return latencies, batcher.batch_sizes
+
+    return asyncio.run(serve())
@@ -0,0 +1,375 @@
+import numpy as np
+
+MINUTES_PER_DAY = 1440.0
+
+FIELDS = (
+    # Epoch and gravity model
+    "jdsatepoch",
+    "jdsatepochF",
+    "radiusearthkm",
+    "xke",
+    "j2",
+    # Mean elements
+    "no_unkozai",
+    "ecco",
+    "inclo",
+    "nodeo",
+    "argpo",
+    "mo",
+    "bstar",
+    # Secular rates and drag coefficients computed by sgp4init
+    "mdot",
+    "argpdot",
+    "nodedot",
+    "nodecf",
+    "isimp",
+    "cc1",
+    "cc4",
+    "cc5",
+    "omgcof",
+    "eta",
+    "xmcof",
+    "delmo",
+    "sinmao",
+    "d2",
+    "d3",
+    "d4",
+    "t2cof",
+    "t3cof",
+    "t4cof",
+    "t5cof",
+    # Short period periodics
+    "aycof",
+    "xlcof",
+    "con41",
+    "x1mth2",
+    "x7thm1",
+)
+
+
+class SatelliteArrays:
+    """Struct of arrays with the initialized elements of many satellites.
+
+    Every name in `FIELDS` is an attribute holding a 1-D array
+    with one value per satellite, so that `sgp4_broadcast` can propagate
+    all of them in vectorized operations. Only near-earth satellites are
+    supported: the deep space (SDP4) terms are not vectorized, and elements
+    of deep space satellites raise a ValueError.
+
+    """
+
+    def __init__(self, **fields):
+        for name in FIELDS:
+            setattr(self, name, np.asarray(fields[name]))
+
+        # sgp4init uses the deep space terms from periods of 225 minutes
+        (deep_space,) = np.nonzero(2 * np.pi / self.no_unkozai >= 225.0)
+        if len(deep_space):
+            raise ValueError(
+                "Deep space satellites are not supported: {}".format(
+                    deep_space.tolist()
+                )
+            )
+
+    @classmethod
+    def from_satrecs(cls, satrecs):
+        """Gather the elements of initialized `sgp4.model.Satrec` objects."""
+        return cls(
+            **{
+                name: np.array([getattr(satrec, name) for satrec in satrecs])
+                for name in FIELDS
+            }
+        )
+
+    @classmethod
+    def from_records(cls, records):
+        """Gather the elements of `cache.SatrecCache` records."""
+        return cls(**{name: records[name] for name in FIELDS})
+
+    def __len__(self):
+        return len(self.no_unkozai)
+
+    def __getitem__(self, index):
+        return type(self)(**{name: getattr(self, name)[index] for name in FIELDS})
+
+    def tsince(self, jd, fr):
+        """Minutes since the epoch of every satellite, shape ``(n, len(jd))``."""
+        return (jd - self.jdsatepoch[:, None]) * MINUTES_PER_DAY + (
+            fr - self.jdsatepochF[:, None]
+        ) * MINUTES_PER_DAY
+
+    def tsince_grid(self, jd, fr, step, count):
+        """Minutes since the epoch of every satellite, shape ``(n, count)``,
+        for the dates ``jd + fr`` plus multiples of ``step`` minutes."""
+        start = self.tsince(np.array([jd]), np.array([fr]))
+        return start + step * np.arange(count)
+
+
+def sgp4_broadcast(
+    satellites,
+    jd,
+    fr,
+    block_size=2 ** 18,
+    dtype=np.float64,
+    out=None,
+    fields=("r", "v"),
+):
+    """Propagate every satellite to every date in vectorized passes.
+
+    Returns ``(e, r, v)`` with shapes ``(n, m)``, ``(n, m, 3)`` and
+    ``(n, m, 3)`` like `sgp4.api.SatrecArray.sgp4`. The satellites are
+    processed in blocks of about ``block_size`` satellite-dates, which
+    bounds the size of the temporaries and keeps them in cache.
+    The results are written into the ``(e, r, v)`` arrays ``out``
+    instead, if given, which may be strided views; ``e`` may be None.
+    Only the positions ``"r"`` and velocities ``"v"`` in ``fields`` are
+    computed, and the others are returned as None.
+
+    With ``dtype=np.float32``, everything but the times since epoch and
+    the secular angles is computed in single precision. The angles grow
+    with time, so they are reduced modulo 2 pi in double precision first.
+
+    """
+    return _sgp4_blocks(
+        satellites,
+        len(jd),
+        lambda block: block.tsince(jd, fr),
+        block_size,
+        dtype,
+        out,
+        fields,
+    )
+
+
+def sgp4_grid(
+    satellites,
+    jd,
+    fr,
+    step,
+    count,
+    block_size=2 ** 18,
+    dtype=np.float64,
+    out=None,
+    fields=("r", "v"),
+):
+    """Propagate every satellite to a regular grid of ``count`` dates.
+
+    The grid starts at ``jd + fr`` and its dates are ``step`` minutes
+    apart. Like `sgp4_broadcast`, but the times since epoch are computed
+    for every block, without arrays of dates.
+
+    """
+    return _sgp4_blocks(
+        satellites,
+        count,
+        lambda block: block.tsince_grid(jd, fr, step, count),
+        block_size,
+        dtype,
+        out,
+        fields,
+    )
+
+
+def _sgp4_blocks(satellites, m, tsince, block_size, dtype, out, fields):
+    dtype = np.dtype(dtype).type
+    n = len(satellites)
+    if out is None:
+        out = (
+            np.empty((n, m), dtype=np.uint8),
+            np.empty((n, m, 3), dtype=dtype) if "r" in fields else None,
+            np.empty((n, m, 3), dtype=dtype) if "v" in fields else None,
+        )
+    e, r, v = out
+    r = r if "r" in fields else None
+    v = v if "v" in fields else None
+    # The errors are needed to mark the invalid dates
+    errors = np.empty((n, m), dtype=np.uint8) if e is None else e
+
+    step = max(block_size // max(m, 1), 1)
+    # Dates with errors produce invalid values, that are replaced by NaN
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for start in range(0, n, step):
+            block = slice(start, start + step)
+            satrec = satellites[block]
+            _sgp4_block(
+                satrec,
+                tsince(satrec),
+                errors[block],
+                None if r is None else r[block],
+                None if v is None else v[block],
+                dtype,
+            )
+
+    return e, r, v
+
+
+def _sgp4_block(satrec, t, e, r, v, dtype):
+    # Vectorized translation of the near earth branch of
+    # sgp4.propagation.sgp4, with the elements as (n, 1) columns
+    # broadcasting against the (n, m) times since epoch
+    def column(name):
+        return getattr(satrec, name)[:, None].astype(dtype, copy=False)
+
+    twopi = dtype(2.0 * np.pi)
+    x2o3 = dtype(2.0 / 3.0)
+    xke = column("xke")
+    vkmpersec = column("radiusearthkm") * xke / dtype(60.0)
+
+    # Update for secular gravity and atmospheric drag
+    xmdf = satrec.mo[:, None] + satrec.mdot[:, None] * t
+    argpdf = satrec.argpo[:, None] + satrec.argpdot[:, None] * t
+    nodedf = satrec.nodeo[:, None] + satrec.nodedot[:, None] * t
+    nodem = nodedf + satrec.nodecf[:, None] * (t * t)
+    if dtype is not np.float64:
+        xmdf, argpdf, nodem = (
+            np.fmod(angle, 2.0 * np.pi).astype(dtype) for angle in (xmdf, argpdf, nodem)
+        )
+        t = t.astype(dtype)
+    t2 = t * t
+    tempa = 1.0 - column("cc1") * t
+    tempe = column("bstar") * column("cc4") * t
+    templ = column("t2cof") * t2
+
+    # Terms skipped for the simplified drag model (isimp == 1)
+    delomg = column("omgcof") * t
+    delmtemp = 1.0 + column("eta") * np.cos(xmdf)
+    delm = column("xmcof") * (delmtemp * delmtemp * delmtemp - column("delmo"))
+    temp = delomg + delm
+    t3 = t2 * t
+    t4 = t3 * t
+    full = column("isimp") != 1
+
+    mm = np.where(full, xmdf + temp, xmdf)
+    argpm = np.where(full, argpdf - temp, argpdf)
+    tempa = np.where(
+        full,
+        tempa - column("d2") * t2 - column("d3") * t3 - column("d4") * t4,
+        tempa,
+    )
+    tempe = np.where(
+        full,
+        tempe + column("bstar") * column("cc5") * (np.sin(mm) - column("sinmao")),
+        tempe,
+    )
+    templ = np.where(
+        full,
+        templ + column("t3cof") * t3 + t4 * (column("t4cof") + t * column("t5cof")),
+        templ,
+    )
+
+    nm = column("no_unkozai")
+    em = column("ecco")
+    inclm = column("inclo")
+
+    error = np.zeros(t.shape, dtype=np.uint8)
+    error[np.broadcast_to(nm <= 0.0, t.shape)] = 2
+
+    am = (xke / nm) ** x2o3 * tempa * tempa
+    nm = xke / am ** 1.5
+    em = em - tempe
+
+    error[(error == 0) & ((em >= 1.0) | (em < -0.001))] = 1
+    em = np.maximum(em, 1.0e-6)
+
+    mm = mm + column("no_unkozai") * templ
+    xlm = mm + argpm + nodem
+
+    nodem = np.fmod(nodem, twopi)
+    argpm = np.mod(argpm, twopi)
+    xlm = np.mod(xlm, twopi)
+    mm = np.mod(xlm - argpm - nodem, twopi)
+
+    sinim = np.sin(inclm)
+    cosim = np.cos(inclm)
+
+    # Long period periodics
+    axnl = em * np.cos(argpm)
+    temp = 1.0 / (am * (1.0 - em * em))
+    aynl = em * np.sin(argpm) + temp * column("aycof")
+    xl = mm + argpm + nodem + temp * column("xlcof") * axnl
+
+    # Solve Kepler's equation, keeping the sine and cosine of the last
+    # iteration of every element like the scalar loop does
+    tolerance = max(1.0e-12, 8 * np.finfo(dtype).eps)
+    u = np.mod(xl - nodem, twopi)
+    eo1 = u
+    sineo1 = np.empty_like(u)
+    coseo1 = np.empty_like(u)
+    active = np.ones(u.shape, dtype=bool)
+    for _ in range(10):
+        sin_eo1 = np.sin(eo1)
+        cos_eo1 = np.cos(eo1)
+        np.copyto(sineo1, sin_eo1, where=active)
+        np.copyto(coseo1, cos_eo1, where=active)
+        tem5 = 1.0 - cos_eo1 * axnl - sin_eo1 * aynl
+        tem5 = (u - aynl * cos_eo1 + axnl * sin_eo1 - eo1) / tem5
+        tem5 = np.clip(tem5, -0.95, 0.95)
+        eo1 = np.where(active, eo1 + tem5, eo1)
+        active &= np.abs(tem5) >= tolerance
+        if not active.any():
+            break
+
+    # Short period preliminary quantities
+    ecose = axnl * coseo1 + aynl * sineo1
+    esine = axnl * sineo1 - aynl * coseo1
+    el2 = axnl * axnl + aynl * aynl
+    pl = am * (1.0 - el2)
+    error[(error == 0) & (pl < 0.0)] = 4
+
+    rl = am * (1.0 - ecose)
+    rdotl = np.sqrt(am) * esine / rl
+    rvdotl = np.sqrt(pl) / rl
+    betal = np.sqrt(1.0 - el2)
+    temp = esine / (1.0 + betal)
+    sinu = am / rl * (sineo1 - aynl - axnl * temp)
+    cosu = am / rl * (coseo1 - axnl + aynl * temp)
+    su = np.arctan2(sinu, cosu)
+    sin2u = (cosu + cosu) * sinu
+    cos2u = 1.0 - 2.0 * sinu * sinu
+    temp = 1.0 / pl
+    temp1 = 0.5 * column("j2") * temp
+    temp2 = temp1 * temp
+
+    # Update for short period periodics
+    con41 = column("con41")
+    x1mth2 = column("x1mth2")
+    mrt = rl * (1.0 - 1.5 * temp2 * betal * con41) + 0.5 * temp1 * x1mth2 * cos2u
+    su = su - 0.25 * temp2 * column("x7thm1") * sin2u
+    xnode = nodem + 1.5 * temp2 * cosim * sin2u
+    xinc = inclm + 1.5 * temp2 * cosim * sinim * cos2u
+
+    # Orientation vectors
+    sinsu = np.sin(su)
+    cossu = np.cos(su)
+    snod = np.sin(xnode)
+    cnod = np.cos(xnode)
+    sini = np.sin(xinc)
+    cosi = np.cos(xinc)
+    xmx = -snod * cosi
+    xmy = cnod * cosi
+    ux = xmx * sinsu + cnod * cossu
+    uy = xmy * sinsu + snod * cossu
+    uz = sini * sinsu
+
+    # Positions and velocities, only if they are wanted
+    if r is not None:
+        mr = mrt * column("radiusearthkm")
+        r[..., 0] = mr * ux
+        r[..., 1] = mr * uy
+        r[..., 2] = mr * uz
+    if v is not None:
+        mvt = rdotl - nm * temp1 * x1mth2 * sin2u / xke
+        rvdot = rvdotl + nm * temp1 * (x1mth2 * cos2u + 1.5 * con41) / xke
+        vx = xmx * cossu - cnod * sinsu
+        vy = xmy * cossu - snod * sinsu
+        vz = sini * cossu
+        v[..., 0] = (mvt * ux + rvdot * vx) * vkmpersec
+        v[..., 1] = (mvt * uy + rvdot * vy) * vkmpersec
+        v[..., 2] = (mvt * uz + rvdot * vz) * vkmpersec
+
+    error[(error == 0) & (mrt < 1.0)] = 6
+    invalid = (error != 0) & (error != 6)
+    for state in (r, v):
+        if state is not None:
+            state[invalid] = np.nan
+    e[...] = error
@@ -0,0 +1,205 @@
+import collections
+import hashlib
+import os
+
+import numpy as np
+import sgp4
+from sgp4.model import Satrec
+
+from catalog import catalog_tles
+
+STRING_FIELDS = {
+    "satnum_str": "S5",
+    "classification": "S1",
+    "intldesg": "S11",
+    "method": "S1",
+    "operationmode": "S1",
+    "init": "S1",
+}
+INTEGER_FIELDS = (
+    "ephtype",
+    "elnum",
+    "epochyr",
+    "error",
+    "irez",
+    "isimp",
+    "revnum",
+    "satnum",
+)
+
+# Every attribute of an initialized `sgp4.model.Satrec` but the transient ones,
+# with ``satnum_str`` since sgp4 2.22, or the integer ``satnum`` before
+RECORD_DTYPE = np.dtype(
+    [
+        (
+            name,
+            STRING_FIELDS.get(name, np.int64 if name in INTEGER_FIELDS else np.float64),
+        )
+        for name in Satrec.__slots__
+        if name not in ("epoch", "error_message")
+    ]
+)
+
+
+def satrec_records(satrecs):
+    """Gather the attributes of initialized `sgp4.model.Satrec` objects."""
+    records = np.zeros(len(satrecs), dtype=RECORD_DTYPE)
+    for name in RECORD_DTYPE.names:
+        records[name] = [getattr(satrec, name) for satrec in satrecs]
+    return records
+
+
+def restore_satrecs(records, factory=Satrec):
+    """Recreate initialized satellites from their records, without `sgp4init`.
+
+    ``factory`` creates an empty satellite that accepts all the attributes
+    of the records, like `sgp4.model.Satrec` does.
+
+    """
+    names = records.dtype.names
+    columns = [
+        np.char.decode(records[name], "ascii").tolist()
+        if name in STRING_FIELDS
+        else records[name].tolist()
+        for name in names
+    ]
+
+    satrecs = []
+    for values in zip(*columns):
+        satrec = factory()
+        for name, value in zip(names, values):
+            setattr(satrec, name, value)
+        satrecs.append(satrec)
+
+    return satrecs
+
+
+class SatrecCache:
+    """Directory of initialized satellite records, memory-mapped when loaded.
+
+    The records of a catalog parsed with `catalog.parse_catalog` are stored
+    in one ``.npy`` file per catalog and gravity model, named after
+    the SHA-256 of its lines, so any change in the TLEs misses the cache.
+    The hash also covers the version of `sgp4` and the layout of
+    `RECORD_DTYPE`, so records initialized by another version are not reused.
+
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, catalog, whichconst):
+        digest = hashlib.sha256(b"%d" % whichconst)
+        digest.update(sgp4.__version__.encode("ascii"))
+        digest.update(str(RECORD_DTYPE.descr).encode("ascii"))
+        digest.update(np.ascontiguousarray(catalog.line1).tobytes())
+        digest.update(np.ascontiguousarray(catalog.line2).tobytes())
+        return os.path.join(self.directory, digest.hexdigest() + ".npy")
+
+    def load(self, catalog, whichconst):
+        """Return the records of ``catalog``, initializing and storing them if needed."""
+        path = self.path(catalog, whichconst)
+        if not os.path.exists(path):
+            records = satrec_records(
+                [Satrec.twoline2rv(*tle, whichconst) for tle in catalog_tles(catalog)]
+            )
+            # Write and rename, so that readers never see a partial file
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, records)
+            os.replace(path + ".tmp", path)
+
+        return np.load(path, mmap_mode="r")
+
+
+class EphemerisCache:
+    """Size-bounded LRU cache of the propagated rows of satellites.
+
+    `propagate` returns the ``(e, r, v)`` of satellites on a regular grid
+    of dates, like the ``propagate_grid`` hook of ``backend``. The row of
+    every satellite is cached under the content of its TLE lines and the
+    grid, so after a catalog update only the satellites with new element
+    sets are built and propagated. The least recently used rows are evicted
+    once all of them take more than ``max_bytes``.
+
+    """
+
+    def __init__(self, backend, max_bytes):
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._rows = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def propagate(self, tles, start, step, count):
+        """Propagate ``tles`` to the grid ``start + step * arange(count)``."""
+        # Integers in microseconds, faster to hash than NumPy scalars
+        grid = (
+            int(np.datetime64(start, "us").astype(np.int64)),
+            int(np.timedelta64(step, "us").astype(np.int64)),
+            count,
+        )
+        keys = [(line1, line2, grid) for line1, line2 in tles]
+
+        rows = []
+        missing = {}
+        for key in keys:
+            row = self._rows.get(key)
+            if row is None:
+                missing.setdefault(key, len(missing))
+            else:
+                self._rows.move_to_end(key)
+            rows.append(row)
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            satellites = self.backend.pack(
+                self.backend.build([key[:2] for key in missing])
+            )
+            e, r, v = self.backend.propagate_grid(
+                satellites, *self.backend.grid_times(start, step, count)
+            )
+            # Copies, so that evicting a row frees it
+            new_rows = [
+                (
+                    None if e is None else np.array(e[index]),
+                    np.array(r[index]),
+                    np.array(v[index]),
+                )
+                for index in range(len(missing))
+            ]
+            rows = [
+                new_rows[missing[key]] if row is None else row
+                for key, row in zip(keys, rows)
+            ]
+            for key, index in missing.items():
+                self._store(key, new_rows[index])
+
+        n = len(rows)
+        errors = rows and rows[0][0] is not None
+        e = np.empty((n, count), dtype=np.uint8) if errors else None
+        r = np.empty((n, count, 3))
+        v = np.empty((n, count, 3))
+        for index, (row_e, row_r, row_v) in enumerate(rows):
+            if errors:
+                e[index] = row_e
+            r[index] = row_r
+            v[index] = row_v
+
+        return e, r, v
+
+    def _store(self, key, row):
+        self._rows[key] = row
+        self.nbytes += _row_bytes(row)
+        while self.nbytes > self.max_bytes and self._rows:
+            _, evicted = self._rows.popitem(last=False)
+            self.nbytes -= _row_bytes(evicted)
+
+
+def _row_bytes(row):
+    return sum(array.nbytes for array in row if array is not None)
@@ -0,0 +1,221 @@
+import numpy as np
+
+LINE_LENGTH = 69
+NAME_LENGTH = 24
+# Radians per minute in a revolution per day
+XPDOTP = 1440.0 / (2.0 * np.pi)
+
+CATALOG_DTYPE = np.dtype(
+    [
+        ("name", "S{}".format(NAME_LENGTH)),
+        ("satnum", np.int64),
+        ("classification", "S1"),
+        ("intldesg", "S8"),
+        ("epochyr", np.int64),
+        ("epochdays", np.float64),
+        ("ndot", np.float64),
+        ("nddot", np.float64),
+        ("bstar", np.float64),
+        ("inclo", np.float64),
+        ("nodeo", np.float64),
+        ("ecco", np.float64),
+        ("argpo", np.float64),
+        ("mo", np.float64),
+        ("no_kozai", np.float64),
+        ("line1", "S{}".format(LINE_LENGTH)),
+        ("line2", "S{}".format(LINE_LENGTH)),
+    ]
+)
+
+
+def checksum(line):
+    """Checksum of a TLE line: its digits plus one per minus sign, modulo 10."""
+    return sum(int(char) if char.isdigit() else char == "-" for char in line[:68]) % 10
+
+
+def parse_catalog(text):
+    """Parse a catalog of 2LE or 3LE elements into a `numpy.recarray`.
+
+    All the lines are split and sliced as fixed-width columns at once,
+    instead of parsing one TLE at a time. The elements keep the units of
+    the TLE format (degrees, revolutions per day) and the fields are those
+    of `CATALOG_DTYPE`, with the original lines in ``line1`` and ``line2``
+    and the names of 3LE catalogs in ``name``. A text without TLEs gives
+    an empty catalog.
+
+    Raises `ValueError` if the lines aren't in pairs or fail their checksum.
+
+    """
+    lines = np.array(text.encode("ascii").splitlines(), dtype=bytes)
+    lines = lines[np.char.str_len(np.char.strip(lines)) > 0]
+    chars = lines.astype("S{}".format(LINE_LENGTH)).view(np.uint8)
+    chars = chars.reshape(len(lines), LINE_LENGTH)
+
+    first = np.flatnonzero((chars[:, 0] == ord("1")) & (chars[:, 1] == ord(" ")))
+    second = np.flatnonzero((chars[:, 0] == ord("2")) & (chars[:, 1] == ord(" ")))
+    if len(first) != len(second) or np.any(first + 1 != second):
+        raise ValueError("Line 1 and line 2 of every TLE must be consecutive")
+
+    line1, line2 = chars[first], chars[second]
+    invalid = ~(_verify_checksum(line1) & _verify_checksum(line2))
+    if invalid.any():
+        raise ValueError(
+            "Invalid checksum in TLEs {}".format(np.flatnonzero(invalid).tolist())
+        )
+
+    catalog = np.zeros(len(first), dtype=CATALOG_DTYPE).view(np.recarray)
+
+    # 3LE catalogs have a name line before every line 1
+    named = np.zeros(len(first), dtype=bool)
+    named[1:] = first[1:] - 1 > second[:-1]
+    named[:1] = first[:1] > 0
+    catalog.name[named] = _names(lines[first[named] - 1])
+
+    catalog.satnum = _satnum(line1)
+    catalog.classification = _column(line1, 7, 8)
+    catalog.intldesg = np.char.strip(_column(line1, 9, 17))
+    catalog.epochyr = _column(line1, 18, 20).astype(np.int64)
+    catalog.epochdays = _column(line1, 20, 32).astype(np.float64)
+    catalog.ndot = _column(line1, 33, 43).astype(np.float64)
+    catalog.nddot = _implied_decimal(line1, 44)
+    catalog.bstar = _implied_decimal(line1, 53)
+
+    catalog.inclo = _column(line2, 8, 16).astype(np.float64)
+    catalog.nodeo = _column(line2, 17, 25).astype(np.float64)
+    catalog.ecco = _assemble(line2, b"0.", (26, 33)).astype(np.float64)
+    catalog.argpo = _column(line2, 34, 42).astype(np.float64)
+    catalog.mo = _column(line2, 43, 51).astype(np.float64)
+    catalog.no_kozai = _column(line2, 52, 63).astype(np.float64)
+
+    catalog.line1 = _column(line1, 0, LINE_LENGTH)
+    catalog.line2 = _column(line2, 0, LINE_LENGTH)
+
+    return catalog
+
+
+def catalog_tles(catalog):
+    """The ``(line1, line2)`` strings of a parsed catalog, as backends build them."""
+    return list(
+        zip(
+            np.char.decode(catalog.line1, "ascii").tolist(),
+            np.char.decode(catalog.line2, "ascii").tolist(),
+        )
+    )
+
+
+def sgp4init_elements(catalog):
+    """The arguments of ``sgp4init`` for every satellite of a parsed catalog.
+
+    Returns a dictionary of arrays named and ordered like the arguments
+    after ``opsmode``: ``satnum``, the ``epoch`` in days since 1949
+    December 31 00:00 UT, and the elements converted to radians and
+    minutes like `sgp4.model.Satrec.twoline2rv` does.
+
+    """
+    year = catalog.epochyr + np.where(catalog.epochyr < 57, 2000, 1900)
+    days, fraction = np.divmod(catalog.epochdays, 1.0)
+    jdsatepoch = year * 365 + (year - 1) // 4 + days + 1721044.5
+
+    return {
+        "satnum": catalog.satnum,
+        "epoch": jdsatepoch - 2433281.5 + np.round(fraction, 8),
+        "bstar": catalog.bstar,
+        "ndot": catalog.ndot / (XPDOTP * 1440.0),
+        "nddot": catalog.nddot / (XPDOTP * 1440.0 * 1440.0),
+        "ecco": catalog.ecco,
+        "argpo": np.radians(catalog.argpo),
+        "inclo": np.radians(catalog.inclo),
+        "mo": np.radians(catalog.mo),
+        "no_kozai": catalog.no_kozai / XPDOTP,
+        "nodeo": np.radians(catalog.nodeo),
+    }
+
+
+def init_satrecs(catalog, factory, whichconst):
+    """Initialize the satellites of a parsed catalog with `sgp4init`.
+
+    ``factory`` creates an empty satellite, like `sgp4.model.Satrec` or
+    `sgp4.wrapper.Satrec`, initialized with the gravity model
+    ``whichconst`` from the elements of the catalog, instead of parsing
+    its lines again.
+
+    """
+    columns = [column.tolist() for column in sgp4init_elements(catalog).values()]
+
+    satrecs = []
+    for satnum, *elements in zip(*columns):
+        satrec = factory()
+        satrec.sgp4init(whichconst, "i", satnum, *elements)
+        satrecs.append(satrec)
+
+    return satrecs
+
+
+def _names(lines):
+    # Satellite names of the name lines, which 2LE catalogs don't have
+    names = np.char.strip(lines)
+    if not len(names):
+        # np.char.partition raises a ValueError on empty arrays
+        return names
+    # Space-Track prefixes the names with "0 ", like a line 0
+    return np.where(
+        np.char.startswith(names, b"0 "), np.char.partition(names, b" ")[:, 2], names
+    )
+
+
+def _column(chars, start, stop):
+    # Fixed-width column of every line as an array of byte strings
+    return (
+        np.ascontiguousarray(chars[:, start:stop])
+        .view("S{}".format(stop - start))
+        .ravel()
+    )
+
+
+def _assemble(chars, *parts):
+    # Concatenate literal byte strings and (start, stop) columns of every line
+    pieces = [
+        np.broadcast_to(np.frombuffer(part, dtype=np.uint8), (len(chars), len(part)))
+        if isinstance(part, bytes)
+        else chars[:, part[0] : part[1]]
+        for part in parts
+    ]
+    return _column(np.hstack(pieces), 0, sum(piece.shape[1] for piece in pieces))
+
+
+def _implied_decimal(chars, start):
+    # Fields like " 12071-3" meaning 0.12071e-3, with a blank exponent sign
+    # read as +
+    exponent_sign = chars[:, start + 6 : start + 7].copy()
+    exponent_sign[exponent_sign == ord(" ")] = ord("+")
+    return _assemble(
+        np.hstack([chars, exponent_sign]),
+        (start, start + 1),
+        b".",
+        (start + 1, start + 6),
+        b"e",
+        (LINE_LENGTH, LINE_LENGTH + 1),
+        (start + 7, start + 8),
+    ).astype(np.float64)
+
+
+def _satnum(chars):
+    # Alpha-5 satellite numbers replace the first digit by a letter,
+    # skipping I and O: A = 10, ..., H = 17, J = 18, ..., Z = 33
+    first = chars[:, 2].astype(np.int64)
+    satnum = _column(chars, 3, 7).astype(np.int64)
+    letter = first >= ord("A")
+    leading = np.where(
+        letter,
+        first - ord("A") + 10 - (first > ord("I")) - (first > ord("O")),
+        first - ord("0"),
+    )
+    leading[first == ord(" ")] = 0
+    return leading * 10000 + satnum
+
+
+def _verify_checksum(chars):
+    body = chars[:, :68]
+    digits = np.where((body >= ord("0")) & (body <= ord("9")), body - ord("0"), 0)
+    total = digits.sum(axis=1) + (body == ord("-")).sum(axis=1)
+    return total % 10 == chars[:, 68] - ord("0")
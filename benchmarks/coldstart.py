@@ -0,0 +1,81 @@
+"""Latency of a backend in a new interpreter, until its first result.
+
+Run as a script, it imports one backend, propagates one satellite
+to one date twice and prints the latencies of every step as JSON.
+
+"""
+import datetime as dt
+import json
+import os
+import subprocess
+import sys
+import time
+
+TLE = (
+    "1 41557U 16033B   20345.20030338  .00003290  00000-0  12071-3 0  9996",
+    "2 41557  97.3998  74.3002 0013100 179.2679 265.4184 15.28602096252616",
+)
+EPOCH = dt.datetime(2020, 12, 11, 12, 0, 0)
+
+
+def measure_cold_start(backend_name, env=None):
+    """Run `coldstart.py` for ``backend_name`` in a new interpreter.
+
+    Returns a dictionary with the seconds taken by every step:
+
+    * ``import``: importing the backend in its ``load`` hook.
+    * ``build`` and ``prepare``: building and preparing the satellite.
+    * ``first_call``: the first ``propagate_many`` call, which includes
+      compiling JIT compiled backends.
+    * ``second_call``: the same call again, when everything is warm.
+    * ``time_to_first_result``: from launching the interpreter
+      to the end of the first call.
+
+    """
+    start = time.time()
+    process = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), backend_name],
+        env=env,
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    latencies = json.loads(process.stdout.splitlines()[-1])
+    latencies["time_to_first_result"] = latencies.pop("first_result_at") - start
+    return latencies
+
+
+def main(backend_name):
+    start = time.perf_counter()
+    from backends import BACKENDS
+
+    backend = BACKENDS[backend_name]
+    backend.load()
+    imported = time.perf_counter()
+
+    satellites = backend.build([TLE])
+    built = time.perf_counter()
+
+    args = backend.prepare_many(satellites, [EPOCH])
+    prepared = time.perf_counter()
+
+    backend.propagate_many(*args)
+    first_call = time.perf_counter()
+    first_result_at = time.time()
+
+    backend.propagate_many(*args)
+    second_call = time.perf_counter()
+
+    latencies = {
+        "import": imported - start,
+        "build": built - imported,
+        "prepare": prepared - built,
+        "first_call": first_call - prepared,
+        "second_call": second_call - first_call,
+        "first_result_at": first_result_at,
+    }
+    print(json.dumps(latencies))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -0,0 +1,65 @@
+import numpy as np
+
+from sgp4.api import jday
+
+JD_UNIX_EPOCH = 2440587.5  # Julian date of 1970-01-01T00:00:00
+
+US_PER_SECOND = 1_000_000
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 3600
+
+
+def datetime_components(epoch):
+    return (
+        epoch.year,
+        epoch.month,
+        epoch.day,
+        epoch.hour,
+        epoch.minute,
+        epoch.second + epoch.microsecond * 1e-6,
+    )
+
+
+def jday_from_epochs(epochs):
+    jd_l, fr_l = [], []
+    for epoch in epochs:
+        jd, fr = jday(*datetime_components(epoch))
+        jd_l.append(jd)
+        fr_l.append(fr)
+
+    return np.array(jd_l), np.array(fr_l)
+
+
+def jday_from_datetime64(epochs):
+    """Vectorized `jday` for an array of `numpy.datetime64` epochs.
+
+    The day and the time of day are split with integer arithmetic,
+    and the fraction of day is then computed with the same floating point
+    operations as `jday`, so that the results are identical to calling it
+    once per epoch (for the years 1900 to 2100, where `jday` is valid).
+
+    """
+    us = np.asarray(epochs, dtype="datetime64[us]").view(np.int64)
+    days, us_of_day = np.divmod(us, 86400 * US_PER_SECOND)
+    seconds, us = np.divmod(us_of_day, US_PER_SECOND)
+    hr, seconds = np.divmod(seconds, SECONDS_PER_HOUR)
+    minute, second = np.divmod(seconds, SECONDS_PER_MINUTE)
+
+    jd = days + JD_UNIX_EPOCH
+    sec = second + us * 1e-6
+    fr = (sec + minute * 60.0 + hr * 3600.0) / 86400.0
+
+    return jd, fr
+
+
+def jday_from_grid(start, step, count):
+    """Vectorized `jday` for the regular grid ``start + step * arange(count)``.
+
+    ``start`` is a `numpy.datetime64` (or anything it accepts, like
+    a `datetime.datetime`) and ``step`` a `numpy.timedelta64`
+    (or a `datetime.timedelta`).
+
+    """
+    start = np.datetime64(start, "us")
+    step = np.timedelta64(step, "us")
+    return jday_from_datetime64(start + step * np.arange(count))
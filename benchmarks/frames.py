@@ -0,0 +1,112 @@
+import numpy as np
+
+# Earth rotation rate (rad/s) without length of day corrections,
+# and WGS 84 ellipsoid (km)
+EARTH_ROTATION = 7.292115146706979e-5
+WGS84_A = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+TWOPI = 2 * np.pi
+
+
+def gmst(jd, fr):
+    """Greenwich mean sidereal time (rad) of the UT1 dates ``jd + fr``.
+
+    Vectorized `sgp4.propagation.gstime` (IAU 1982 model), with the
+    day and the fraction of day kept apart for precision. UTC dates, like
+    the dates of the benchmarks, are off by less than 0.9 s of rotation.
+
+    """
+    tut1 = ((jd - 2451545.0) + fr) / 36525.0
+    seconds = (
+        -6.2e-6 * tut1 * tut1 * tut1
+        + 0.093104 * tut1 * tut1
+        + (876600.0 * 3600 + 8640184.812866) * tut1
+        + 67310.54841
+    )
+    return np.mod(np.radians(seconds / 240.0), TWOPI)
+
+
+def teme_to_ecef(r, v, jd, fr):
+    """Rotate TEME positions and velocities to the Earth-fixed frame.
+
+    ``r`` and ``v`` have shape ``(..., m, 3)`` and ``jd`` and ``fr``
+    shape ``(m,)``, like the outputs and the dates of ``propagate_many``,
+    or any shape that broadcasts against ``r[..., 0]``.
+    Polar motion is neglected, so the frame is the pseudo Earth fixed
+    frame of Vallado, within about 10 m of ITRF.
+
+    """
+    theta = gmst(jd, fr)
+    cos, sin = np.cos(theta), np.sin(theta)
+    x, y, z = r[..., 0], r[..., 1], r[..., 2]
+    vx, vy, vz = v[..., 0], v[..., 1], v[..., 2]
+
+    r_ecef = np.empty(np.shape(r))
+    r_ecef[..., 0] = cos * x + sin * y
+    r_ecef[..., 1] = cos * y - sin * x
+    r_ecef[..., 2] = z
+
+    # Velocity relative to the rotating frame
+    v_ecef = np.empty(np.shape(v))
+    v_ecef[..., 0] = cos * vx + sin * vy + EARTH_ROTATION * r_ecef[..., 1]
+    v_ecef[..., 1] = cos * vy - sin * vx - EARTH_ROTATION * r_ecef[..., 0]
+    v_ecef[..., 2] = vz
+
+    return r_ecef, v_ecef
+
+
+def ecef_to_geodetic(r):
+    """Geodetic latitude, longitude (rad) and altitude (km) of ECEF positions.
+
+    Uses the closed form solution of Heikkinen on the WGS 84 ellipsoid,
+    accurate to less than a millimeter, without iterations.
+
+    """
+    x, y, z = r[..., 0], r[..., 1], r[..., 2]
+    a, b, e2 = WGS84_A, WGS84_B, WGS84_E2
+    ep2 = e2 / (1 - e2)
+
+    p = np.hypot(x, y)
+    z2 = z * z
+    f = 54 * b * b * z2
+    g = p * p + (1 - e2) * z2 - e2 * (a * a - b * b)
+    c = e2 * e2 * f * p * p / (g * g * g)
+    s = np.cbrt(1 + c + np.sqrt(c * c + 2 * c))
+    k = s + 1 + 1 / s
+    big_p = f / (3 * k * k * g * g)
+    q = np.sqrt(1 + 2 * e2 * e2 * big_p)
+    r0 = -big_p * e2 * p / (1 + q) + np.sqrt(
+        np.maximum(
+            a * a / 2 * (1 + 1 / q)
+            - big_p * (1 - e2) * z2 / (q * (1 + q))
+            - big_p * p * p / 2,
+            0.0,
+        )
+    )
+    u2 = (p - e2 * r0) ** 2
+    u = np.sqrt(u2 + z2)
+    v = np.sqrt(u2 + (1 - e2) * z2)
+    z0 = b * b * z / (a * v)
+
+    latitude = np.arctan2(z + ep2 * z0, p)
+    longitude = np.arctan2(y, x)
+    altitude = u * (1 - b * b / (a * v))
+    return latitude, longitude, altitude
+
+
+def geodetic_to_ecef(latitude, longitude, altitude):
+    """ECEF positions (km) of geodetic coordinates on the WGS 84 ellipsoid."""
+    sin_lat = np.sin(latitude)
+    radius = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_lat * sin_lat)
+    horizontal = (radius + altitude) * np.cos(latitude)
+    return np.stack(
+        [
+            horizontal * np.cos(longitude),
+            horizontal * np.sin(longitude),
+            (radius * (1 - WGS84_E2) + altitude) * sin_lat,
+        ],
+        axis=-1,
+    )
@@ -0,0 +1,274 @@
+"""History of benchmark runs in a SQLite database, with regression detection.
+
+Every run stores the timings of the rounds of every benchmark,
+and is compared with the previous runs on the same machine. To print the
+report of the last run of a database::
+
+    python benchmarks/history.py HISTORY.sqlite
+
+"""
+import argparse
+import datetime as dt
+import importlib.metadata
+import json
+import math
+import os
+import platform
+import sqlite3
+
+import numpy as np
+
+# Number of previous runs pooled as the baseline of every benchmark
+BASELINE_RUNS = 5
+# Rounds of a run, and of its baseline, needed to test for a regression
+MIN_ROUNDS = 5
+# A slowdown is a regression if its p-value is below this
+SIGNIFICANCE = 0.01
+# and the median is slower by more than this fraction
+MIN_SLOWDOWN = 0.05
+
+DISTRIBUTIONS = ("numpy", "numba", "sgp4", "sgp4-vec", "cysgp4", "pytest-benchmark")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    machine TEXT NOT NULL,
+    environment TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    name TEXT NOT NULL,
+    scenario TEXT NOT NULL,
+    backend TEXT,
+    rounds INTEGER NOT NULL,
+    median REAL NOT NULL,
+    times BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_name ON results (name, run_id);
+"""
+
+
+def _cpu_model():
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def environment():
+    """Metadata of the machine and of the versions of the backends."""
+    versions = {}
+    for distribution in DISTRIBUTIONS:
+        try:
+            versions[distribution] = importlib.metadata.version(distribution)
+        except importlib.metadata.PackageNotFoundError:
+            versions[distribution] = None
+
+    return {
+        "node": platform.node(),
+        "cpu": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": versions,
+    }
+
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def store_run(path, records, environment):
+    """Store the ``(name, scenario, backend, times)`` records of one run.
+
+    ``times`` are the timings of the rounds of the benchmark.
+    Returns the id of the new run.
+
+    """
+    machine = "{} ({})".format(environment["node"], environment["cpu"])
+    with connect(path) as connection:
+        run_id = connection.execute(
+            "INSERT INTO runs (started, machine, environment) VALUES (?, ?, ?)",
+            (
+                dt.datetime.now().isoformat(timespec="seconds"),
+                machine,
+                json.dumps(environment),
+            ),
+        ).lastrowid
+        connection.executemany(
+            "INSERT INTO results "
+            "(run_id, name, scenario, backend, rounds, median, times) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    name,
+                    scenario,
+                    backend,
+                    len(times),
+                    float(np.median(times)),
+                    np.asarray(times, dtype=np.float64).tobytes(),
+                )
+                for name, scenario, backend, times in records
+            ],
+        )
+    connection.close()
+    return run_id
+
+
+def mann_whitney_greater(sample, baseline):
+    """One-sided p-value of the Mann-Whitney U test that ``sample`` is larger.
+
+    Uses the normal approximation with tie correction,
+    which is accurate enough from `MIN_ROUNDS` rounds.
+
+    """
+    n1, n2 = len(sample), len(baseline)
+    n = n1 + n2
+    _, inverse, counts = np.unique(
+        np.concatenate([sample, baseline]), return_inverse=True, return_counts=True
+    )
+    ranks = (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+
+    ties = (counts ** 3 - counts).sum()
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_run(path, run_id=None):
+    """Compare every benchmark of a run (by default, the last) with its baseline.
+
+    The baseline pools the rounds of the previous `BASELINE_RUNS` runs of
+    the same benchmark on the same machine. A regression is significantly
+    slower than the baseline (`SIGNIFICANCE`), by more than `MIN_SLOWDOWN`,
+    and slower than every baseline run. Benchmarks with fewer than
+    `MIN_ROUNDS` rounds in the run or in its baseline aren't tested.
+    Returns one dictionary per benchmark, with the ``history`` of the
+    baseline medians.
+
+    """
+    with connect(path) as connection:
+        if run_id is None:
+            (run_id,) = connection.execute("SELECT MAX(id) FROM runs").fetchone()
+        row = connection.execute(
+            "SELECT machine FROM runs WHERE id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError("No run {} in {}".format(run_id, path))
+        (machine,) = row
+
+        comparisons = []
+        for name, scenario, backend, median, times in connection.execute(
+            "SELECT name, scenario, backend, median, times FROM results "
+            "WHERE run_id = ? ORDER BY scenario, backend, name",
+            (run_id,),
+        ).fetchall():
+            previous = connection.execute(
+                "SELECT results.median, results.times FROM results "
+                "JOIN runs ON runs.id = results.run_id "
+                "WHERE results.name = ? AND runs.machine = ? AND runs.id < ? "
+                "ORDER BY runs.id DESC LIMIT ?",
+                (name, machine, run_id, BASELINE_RUNS),
+            ).fetchall()[::-1]
+
+            comparison = {
+                "name": name,
+                "scenario": scenario,
+                "backend": backend,
+                "median": median,
+                "history": [row[0] for row in previous],
+                "baseline": None,
+                "change": None,
+                "p_value": None,
+                "regression": False,
+            }
+            if not previous:
+                comparisons.append(comparison)
+                continue
+
+            times = np.frombuffer(times)
+            baseline = np.concatenate([np.frombuffer(row[1]) for row in previous])
+            comparison["baseline"] = float(np.median(baseline))
+            comparison["change"] = median / comparison["baseline"] - 1
+            if min(len(times), len(baseline)) >= MIN_ROUNDS:
+                comparison["p_value"] = mann_whitney_greater(times, baseline)
+                # The rounds of one run miss the noise between runs,
+                # so a regression must also be slower than every baseline run
+                comparison["regression"] = (
+                    comparison["p_value"] < SIGNIFICANCE
+                    and comparison["change"] > MIN_SLOWDOWN
+                    and median > max(comparison["history"])
+                )
+            comparisons.append(comparison)
+    connection.close()
+
+    return comparisons
+
+
+def format_trend_report(comparisons):
+    width = max([len(comparison["name"]) for comparison in comparisons] + [4])
+    lines = [
+        "{:<{width}}  {:>12}  {:>13}  {:>8}  {:>8}  {}".format(
+            "Name",
+            "Median (us)",
+            "Baseline (us)",
+            "Change",
+            "p-value",
+            "Trend (us)",
+            width=width,
+        )
+    ]
+    for comparison in comparisons:
+        trend = " ".join(
+            "{:.4g}".format(median * 1e6)
+            for median in comparison["history"] + [comparison["median"]]
+        )
+        baseline = change = p_value = "-"
+        if comparison["baseline"] is not None:
+            baseline = "{:.4g}".format(comparison["baseline"] * 1e6)
+            change = "{:+.1%}".format(comparison["change"])
+        if comparison["p_value"] is not None:
+            p_value = "{:.2g}".format(comparison["p_value"])
+        lines.append(
+            "{:<{width}}  {:>12.4g}  {:>13}  {:>8}  {:>8}  {}{}".format(
+                comparison["name"],
+                comparison["median"] * 1e6,
+                baseline,
+                change,
+                p_value,
+                trend,
+                "  REGRESSION" if comparison["regression"] else "",
+                width=width,
+            )
+        )
+
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report benchmark regressions.")
+    parser.add_argument("database", help="Database of --benchmark-history.")
+    parser.add_argument("--run", type=int, help="Run to report (default: last).")
+    args = parser.parse_args(argv)
+
+    comparisons = compare_run(args.database, args.run)
+    for line in format_trend_report(comparisons):
+        print(line)
+
+    return 1 if any(comparison["regression"] for comparison in comparisons) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+
+
+def hermite_basis(stride):
+    """Cubic Hermite basis at ``stride`` evenly spaced fractions of an interval.
+
+    Returns the ``(stride, 4)`` matrices of the weights of the values
+    and of the derivatives of the interpolated function, for the values
+    and derivatives ``(p0, m0, p1, m1)`` at both ends of the interval.
+
+    """
+    s = np.arange(stride)[:, None] / stride
+    s2 = s * s
+    s3 = s2 * s
+    values = np.hstack([2 * s3 - 3 * s2 + 1, s3 - 2 * s2 + s, 3 * s2 - 2 * s3, s3 - s2])
+    derivatives = np.hstack(
+        [6 * s2 - 6 * s, 3 * s2 - 4 * s + 1, 6 * s - 6 * s2, 3 * s2 - 2 * s]
+    )
+    return values, derivatives
+
+
+def hermite_interpolate(r, v, node_step, stride):
+    """Cubic Hermite interpolation of positions and velocities between nodes.
+
+    ``r`` and ``v``, with shape ``(..., k, 3)``, are the positions (km)
+    and velocities (km/s) at ``k`` nodes spaced ``node_step`` seconds
+    apart. Returns the ``(r, v)`` of the ``stride * (k - 1) + 1`` dates
+    spaced ``node_step / stride`` seconds apart from the first node to the
+    last one, the velocities being the derivatives of the interpolated
+    positions.
+
+    """
+    values, derivatives = hermite_basis(stride)
+    # (..., k - 1, 4, 3) ends of every interval, multiplied
+    # by the (stride, 4) basis into (..., k - 1, stride, 3)
+    ends = np.stack(
+        [
+            r[..., :-1, :],
+            v[..., :-1, :] * node_step,
+            r[..., 1:, :],
+            v[..., 1:, :] * node_step,
+        ],
+        axis=-2,
+    )
+    shape = r.shape[:-2] + (-1, 3)
+    return (
+        np.concatenate([(values @ ends).reshape(shape), r[..., -1:, :]], axis=-2),
+        np.concatenate(
+            [(derivatives @ ends).reshape(shape) / node_step, v[..., -1:, :]], axis=-2
+        ),
+    )
+
+
+def propagate_interpolated(backend, satellites, start, step, count, stride):
+    """Propagate packed ``satellites`` to a regular grid by interpolation.
+
+    The backend only propagates one date of the grid
+    ``start + step * arange(count)`` in every ``stride``, with its
+    ``propagate_grid`` hook, and the dates in between are interpolated with
+    `hermite_interpolate`. Returns ``(e, r, v)`` like ``propagate_grid``,
+    with the error of a date being the largest of its two nodes.
+
+    """
+    nodes = max(math.ceil((count - 1) / stride), 1) + 1
+    node_step = stride * (np.timedelta64(step, "us") / np.timedelta64(1, "s"))
+
+    e, r, v = backend.propagate_grid(
+        satellites,
+        *backend.grid_times(start, stride * np.timedelta64(step, "us"), nodes)
+    )
+    r, v = hermite_interpolate(np.asarray(r), np.asarray(v), node_step, stride)
+    if e is not None:
+        e = np.concatenate(
+            [
+                np.repeat(np.maximum(e[..., :-1], e[..., 1:]), stride, axis=-1),
+                e[..., -1:],
+            ],
+            axis=-1,
+        )
+        e = e[..., :count]
+
+    return e, r[..., :count, :], v[..., :count, :]
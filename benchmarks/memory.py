@@ -0,0 +1,154 @@
+import resource
+import sys
+import tracemalloc
+
+from pytest_benchmark.fixture import BenchmarkFixture
+
+MEMORY_COLUMNS = ("peak_rss", "tracemalloc_peak", "retained_blocks")
+
+
+def _status_kb(field):
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+
+
+def _reset_peak_rss():
+    """Reset the peak RSS of the process, returning whether it's supported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")  # Linux >= 4.0
+    except OSError:
+        return False
+    return True
+
+
+def _max_rss_kb():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def measure_memory(function, *args, **kwargs):
+    """Call ``function`` once, returning its result and the memory it used.
+
+    The memory usage is a dictionary with sizes in bytes:
+
+    * ``peak_rss``: increase of the peak resident set size during the call.
+      Outside of Linux, the peak can't be reset, so this is the increase
+      of the peak of the whole process and it is 0 unless the call set
+      a new maximum.
+    * ``tracemalloc_peak``: peak of the memory traced by `tracemalloc`,
+      which includes NumPy array data. If `tracemalloc` was already
+      tracing before Python 3.9, its peak can't be reset, so this is the
+      peak since it started.
+    * ``retained_blocks``: number of traced memory blocks still allocated
+      after the call, like the ones owned by the result. CPython doesn't
+      count allocation events, so this is the closest measure.
+
+    """
+    resettable = _reset_peak_rss()
+    rss_before = _status_kb("VmRSS") if resettable else _max_rss_kb()
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, "reset_peak"):  # Python >= 3.9
+        tracemalloc.reset_peak()
+    traces_before = len(tracemalloc.take_snapshot().traces)
+    try:
+        result = function(*args, **kwargs)
+        _, tracemalloc_peak = tracemalloc.get_traced_memory()
+        retained_blocks = len(tracemalloc.take_snapshot().traces) - traces_before
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    peak_rss = _status_kb("VmHWM") if resettable else _max_rss_kb()
+    return result, {
+        "peak_rss": max(peak_rss - rss_before, 0) * 1024,
+        "tracemalloc_peak": tracemalloc_peak,
+        "retained_blocks": retained_blocks,
+    }
+
+
+class MemoryBenchmarkFixture(BenchmarkFixture):
+    """pytest-benchmark fixture that also records memory usage.
+
+    After the timed rounds, the benchmarked function (or the target of
+    `pedantic`, with new arguments from its ``setup``) is called once more
+    with the memory instrumentation, so that it doesn't distort timings,
+    and the results are stored in ``extra_info``. The benchmark still
+    returns the result of the timed rounds. With ``records = None``
+    the memory isn't measured, for subclasses that only add other
+    instrumentation in `_instrumented`.
+
+    """
+
+    @classmethod
+    def from_fixture(cls, benchmark, records):
+        # pytest-benchmark only accepts instances of its own fixture class
+        benchmark.__class__ = cls
+        benchmark.memory_records = records
+        return benchmark
+
+    def __call__(self, function, *args, **kwargs):
+        result = super().__call__(function, *args, **kwargs)
+        return self._instrumented(result, function, lambda: (args, kwargs))
+
+    def pedantic(self, target, args=(), kwargs=None, setup=None, **options):
+        result = super().pedantic(target, args, kwargs, setup, **options)
+
+        def arguments():
+            # Like the timed rounds, the setup may return the arguments
+            return (setup and setup()) or (args, kwargs or {})
+
+        return self._instrumented(result, target, arguments)
+
+    def _instrumented(self, result, function, arguments):
+        # Instrument one more call of function with the (args, kwargs)
+        # returned by arguments, returning the result of the timed rounds
+        if not self.disabled and self.memory_records is not None:
+            args, kwargs = arguments()
+            _, memory = measure_memory(function, *args, **kwargs)
+            self.extra_info.update(memory)
+            self.memory_records.append((self.name, memory))
+
+        return result
+
+
+def format_memory_table(records):
+    """Format the memory usage of every benchmark, grouped by test function."""
+    groups = {}
+    for name, memory in records:
+        groups.setdefault(name.split("[")[0], []).append((name, memory))
+
+    lines = []
+    for group, rows in sorted(groups.items()):
+        rows.sort(key=lambda row: row[1]["peak_rss"])
+        width = max(len(name) for name, _ in rows)
+        lines.append(
+            "benchmark {!r} memory: {} tests".format(group, len(rows)),
+        )
+        lines.append(
+            "{:<{width}}  {:>14}  {:>20}  {:>15}".format(
+                "Name",
+                "Peak RSS (MiB)",
+                "Tracemalloc peak (MiB)",
+                "Retained blocks",
+                width=width,
+            )
+        )
+        for name, memory in rows:
+            lines.append(
+                "{:<{width}}  {:>14.2f}  {:>20.2f}  {:>15d}".format(
+                    name,
+                    memory["peak_rss"] / 2 ** 20,
+                    memory["tracemalloc_peak"] / 2 ** 20,
+                    memory["retained_blocks"],
+                    width=width,
+                )
+            )
+        lines.append("")
+
+    return lines
@@ -0,0 +1,293 @@
+import math
+
+import numpy as np
+from numba import njit, prange
+
+from broadcast import FIELDS, MINUTES_PER_DAY
+
+
+def elements(satellites):
+    """Initialized elements of near-earth satellites, shape ``(n, len(FIELDS))``.
+
+    Every row holds the `FIELDS` of one satellite of the `SatelliteArrays`
+    ``satellites``, in order.
+
+    """
+    return np.column_stack(
+        [getattr(satellites, name).astype(np.float64) for name in FIELDS]
+    )
+
+
+def sgp4_parallel(elements, jd, fr, out=None, fields=("r", "v")):
+    """Propagate every satellite to every date in parallel over the satellites.
+
+    Returns ``(e, r, v)`` with shapes ``(n, m)``, ``(n, m, 3)`` and
+    ``(n, m, 3)`` like `sgp4.api.SatrecArray.sgp4`. The satellites are
+    split across the threads of the Numba threading layer, so the number
+    of threads is controlled with `numba.set_num_threads`.
+    The results are written into the ``(e, r, v)`` arrays ``out``
+    instead, if given, which may be strided views; ``e`` may be None.
+    Only the positions ``"r"`` and velocities ``"v"`` in ``fields`` are
+    computed, and the others are returned as None.
+
+    """
+    e, r, v = _outputs(len(elements), len(jd), out, fields)
+    _sgp4_many(elements, jd, fr, *_writable(len(elements), len(jd), e, r, v))
+    return e, r, v
+
+
+def sgp4_parallel_grid(elements, jd, fr, step, count, out=None, fields=("r", "v")):
+    """Propagate every satellite to a regular grid of ``count`` dates.
+
+    The grid starts at ``jd + fr`` and its dates are ``step`` minutes
+    apart. Like `sgp4_parallel`, but the times since epoch are computed
+    in the loop, without arrays of dates.
+
+    """
+    e, r, v = _outputs(len(elements), count, out, fields)
+    _sgp4_grid(elements, jd, fr, step, *_writable(len(elements), count, e, r, v))
+    return e, r, v
+
+
+def _outputs(n, m, out, fields):
+    if out is None:
+        out = (
+            np.empty((n, m), dtype=np.uint8),
+            np.empty((n, m, 3)) if "r" in fields else None,
+            np.empty((n, m, 3)) if "v" in fields else None,
+        )
+    e, r, v = out
+    return e, r if "r" in fields else None, v if "v" in fields else None
+
+
+def _writable(n, m, e, r, v):
+    # The kernels always write the errors, and take the arrays of the
+    # unwanted states as zero strided scratch arrays they don't write
+    if e is None:
+        e = np.empty((n, m), dtype=np.uint8)
+    scratch = np.lib.stride_tricks.as_strided(np.empty(3), (n, m, 3), (0, 0, 8))
+    return (
+        e,
+        scratch if r is None else r,
+        scratch if v is None else v,
+        r is not None,
+        v is not None,
+    )
+
+
+@njit(cache=True)
+def _tsince(elements, jd, fr):
+    jdsatepoch, jdsatepochF = elements[0], elements[1]
+    return (jd - jdsatepoch) * MINUTES_PER_DAY + (fr - jdsatepochF) * MINUTES_PER_DAY
+
+
+@njit(parallel=True, cache=True)
+def _sgp4_many(elements, jd, fr, e, r, v, positions, velocities):
+    for i in prange(len(elements)):
+        for j in range(len(jd)):
+            t = _tsince(elements[i], jd[j], fr[j])
+            e[i, j] = _sgp4(elements[i], t, r[i, j], v[i, j], positions, velocities)
+
+
+@njit(parallel=True, cache=True)
+def _sgp4_grid(elements, jd, fr, step, e, r, v, positions, velocities):
+    for i in prange(len(elements)):
+        start = _tsince(elements[i], jd, fr)
+        for j in range(e.shape[1]):
+            e[i, j] = _sgp4(
+                elements[i], start + step * j, r[i, j], v[i, j], positions, velocities
+            )
+
+
+@njit(cache=True)
+def _invalid(r, v, positions, velocities):
+    if positions:
+        r[:] = np.nan
+    if velocities:
+        v[:] = np.nan
+
+
+@njit(cache=True)
+def _sgp4(elements, t, r, v, positions=True, velocities=True):
+    # Scalar translation of the near earth branch of sgp4.propagation.sgp4
+    # at t minutes since epoch, writing into r and v (unless positions or
+    # velocities are False) and returning the error
+    (
+        jdsatepoch,
+        jdsatepochF,
+        radiusearthkm,
+        xke,
+        j2,
+        no_unkozai,
+        ecco,
+        inclo,
+        nodeo,
+        argpo,
+        mo,
+        bstar,
+        mdot,
+        argpdot,
+        nodedot,
+        nodecf,
+        isimp,
+        cc1,
+        cc4,
+        cc5,
+        omgcof,
+        eta,
+        xmcof,
+        delmo,
+        sinmao,
+        d2,
+        d3,
+        d4,
+        t2cof,
+        t3cof,
+        t4cof,
+        t5cof,
+        aycof,
+        xlcof,
+        con41,
+        x1mth2,
+        x7thm1,
+    ) = elements
+
+    twopi = 2.0 * math.pi
+    x2o3 = 2.0 / 3.0
+    vkmpersec = radiusearthkm * xke / 60.0
+
+    # Update for secular gravity and atmospheric drag
+    xmdf = mo + mdot * t
+    argpdf = argpo + argpdot * t
+    nodedf = nodeo + nodedot * t
+    argpm = argpdf
+    mm = xmdf
+    t2 = t * t
+    nodem = nodedf + nodecf * t2
+    tempa = 1.0 - cc1 * t
+    tempe = bstar * cc4 * t
+    templ = t2cof * t2
+
+    if isimp != 1:
+        delomg = omgcof * t
+        delmtemp = 1.0 + eta * math.cos(xmdf)
+        delm = xmcof * (delmtemp * delmtemp * delmtemp - delmo)
+        temp = delomg + delm
+        mm = xmdf + temp
+        argpm = argpdf - temp
+        t3 = t2 * t
+        t4 = t3 * t
+        tempa = tempa - d2 * t2 - d3 * t3 - d4 * t4
+        tempe = tempe + bstar * cc5 * (math.sin(mm) - sinmao)
+        templ = templ + t3cof * t3 + t4 * (t4cof + t * t5cof)
+
+    nm = no_unkozai
+    em = ecco
+    inclm = inclo
+
+    if nm <= 0.0:
+        _invalid(r, v, positions, velocities)
+        return 2
+
+    am = (xke / nm) ** x2o3 * tempa * tempa
+    nm = xke / am ** 1.5
+    em = em - tempe
+
+    if em >= 1.0 or em < -0.001:
+        _invalid(r, v, positions, velocities)
+        return 1
+    if em < 1.0e-6:
+        em = 1.0e-6
+
+    mm = mm + no_unkozai * templ
+    xlm = mm + argpm + nodem
+
+    nodem = nodem % twopi if nodem >= 0.0 else -(-nodem % twopi)
+    argpm = argpm % twopi
+    xlm = xlm % twopi
+    mm = (xlm - argpm - nodem) % twopi
+
+    sinim = math.sin(inclm)
+    cosim = math.cos(inclm)
+
+    # Long period periodics
+    axnl = em * math.cos(argpm)
+    temp = 1.0 / (am * (1.0 - em * em))
+    aynl = em * math.sin(argpm) + temp * aycof
+    xl = mm + argpm + nodem + temp * xlcof * axnl
+
+    # Solve Kepler's equation
+    u = (xl - nodem) % twopi
+    eo1 = u
+    tem5 = 9999.9
+    ktr = 1
+    sineo1 = 0.0
+    coseo1 = 0.0
+    while abs(tem5) >= 1.0e-12 and ktr <= 10:
+        sineo1 = math.sin(eo1)
+        coseo1 = math.cos(eo1)
+        tem5 = 1.0 - coseo1 * axnl - sineo1 * aynl
+        tem5 = (u - aynl * coseo1 + axnl * sineo1 - eo1) / tem5
+        if abs(tem5) >= 0.95:
+            tem5 = 0.95 if tem5 > 0.0 else -0.95
+        eo1 = eo1 + tem5
+        ktr = ktr + 1
+
+    # Short period preliminary quantities
+    ecose = axnl * coseo1 + aynl * sineo1
+    esine = axnl * sineo1 - aynl * coseo1
+    el2 = axnl * axnl + aynl * aynl
+    pl = am * (1.0 - el2)
+    if pl < 0.0:
+        _invalid(r, v, positions, velocities)
+        return 4
+
+    rl = am * (1.0 - ecose)
+    rdotl = math.sqrt(am) * esine / rl
+    rvdotl = math.sqrt(pl) / rl
+    betal = math.sqrt(1.0 - el2)
+    temp = esine / (1.0 + betal)
+    sinu = am / rl * (sineo1 - aynl - axnl * temp)
+    cosu = am / rl * (coseo1 - axnl + aynl * temp)
+    su = math.atan2(sinu, cosu)
+    sin2u = (cosu + cosu) * sinu
+    cos2u = 1.0 - 2.0 * sinu * sinu
+    temp = 1.0 / pl
+    temp1 = 0.5 * j2 * temp
+    temp2 = temp1 * temp
+
+    # Update for short period periodics
+    mrt = rl * (1.0 - 1.5 * temp2 * betal * con41) + 0.5 * temp1 * x1mth2 * cos2u
+    su = su - 0.25 * temp2 * x7thm1 * sin2u
+    xnode = nodem + 1.5 * temp2 * cosim * sin2u
+    xinc = inclm + 1.5 * temp2 * cosim * sinim * cos2u
+
+    # Orientation vectors
+    sinsu = math.sin(su)
+    cossu = math.cos(su)
+    snod = math.sin(xnode)
+    cnod = math.cos(xnode)
+    sini = math.sin(xinc)
+    cosi = math.cos(xinc)
+    xmx = -snod * cosi
+    xmy = cnod * cosi
+    ux = xmx * sinsu + cnod * cossu
+    uy = xmy * sinsu + snod * cossu
+    uz = sini * sinsu
+
+    if positions:
+        mr = mrt * radiusearthkm
+        r[0] = mr * ux
+        r[1] = mr * uy
+        r[2] = mr * uz
+    if velocities:
+        mvt = rdotl - nm * temp1 * x1mth2 * sin2u / xke
+        rvdot = rvdotl + nm * temp1 * (x1mth2 * cos2u + 1.5 * con41) / xke
+        vx = xmx * cossu - cnod * sinsu
+        vy = xmy * cossu - snod * sinsu
+        vz = sini * cossu
+        v[0] = (mvt * ux + rvdot * vx) * vkmpersec
+        v[1] = (mvt * uy + rvdot * vy) * vkmpersec
+        v[2] = (mvt * uz + rvdot * vz) * vkmpersec
+
+    return 6 if mrt < 1.0 else 0
@@ -0,0 +1,318 @@
+import math
+
+import numpy as np
+
+from catalog import parse_catalog
+from epochs import jday_from_grid
+from frames import WGS84_A, geodetic_to_ecef, teme_to_ecef
+from interpolation import hermite_interpolate
+
+# Gravitational parameter of the WGS 72 model of the TLEs (km³/s²)
+MU = 398600.8
+# Margin of the visibility test for the perturbations of the orbits
+VISIBILITY_MARGIN = math.radians(1.0)
+
+PASS_DTYPE = np.dtype(
+    [
+        ("station", np.intp),
+        ("satellite", np.intp),
+        # Seconds since the start, NaN if outside of the propagated dates
+        ("rise", np.float64),
+        ("culmination", np.float64),
+        ("set", np.float64),
+        ("max_elevation", np.float64),
+    ]
+)
+
+
+def can_be_visible(tles, stations, min_elevation=0.0):
+    """Mask ``(len(stations), len(tles))`` of the satellites each station may see.
+
+    ``stations`` are ``(latitude, longitude, altitude)`` rows,
+    in radians and km. A satellite can't rise above ``min_elevation``
+    (rad) at a station further from the equator than its inclination plus
+    the radius of its visibility footprint at apogee.
+
+    """
+    catalog = parse_catalog(
+        "".join("{}\n{}\n".format(line1, line2) for line1, line2 in tles)
+    )
+    inclination = np.radians(catalog.inclo)
+    max_latitude = np.minimum(inclination, np.pi - inclination)
+
+    mean_motion = catalog.no_kozai * 2 * np.pi / 86400
+    apogee = (MU / mean_motion ** 2) ** (1 / 3) * (1 + catalog.ecco)
+    footprint = (
+        np.arccos(np.minimum(WGS84_A * np.cos(min_elevation) / apogee, 1.0))
+        - min_elevation
+    )
+
+    latitude = np.abs(np.asarray(stations)[:, 0])
+    return latitude[:, None] <= max_latitude + footprint + VISIBILITY_MARGIN
+
+
+def _topocentric(stations):
+    latitude, longitude, altitude = np.asarray(stations, dtype=np.float64).T
+    up = np.stack(
+        [
+            np.cos(latitude) * np.cos(longitude),
+            np.cos(latitude) * np.sin(longitude),
+            np.sin(latitude),
+        ],
+        axis=-1,
+    )
+    return geodetic_to_ecef(latitude, longitude, altitude), up
+
+
+def _elevation(r, station, up):
+    # Elevation (rad) of the ECEF positions r, NaN for propagation errors
+    relative = r - station
+    return np.arcsin(np.sum(relative * up, axis=-1) / np.linalg.norm(relative, axis=-1))
+
+
+def _runs(elevation, min_elevation):
+    # (rows, first, stop) of the runs of dates above min_elevation,
+    # and the date of the highest elevation of every run
+    with np.errstate(invalid="ignore"):
+        above = np.pad(elevation > min_elevation, ((0, 0), (1, 1)))
+    rows, edges = np.nonzero(np.diff(above.astype(np.int8), axis=1))
+    rows, first, stop = rows[::2], edges[::2], edges[1::2]
+    peak = np.array(
+        [
+            start + np.argmax(elevation[row, start:end])
+            for row, start, end in zip(rows, first, stop)
+        ],
+        dtype=np.intp,
+    )
+    return rows, first, stop, peak
+
+
+def _crossing(before, after, min_elevation):
+    # Fraction of the step between two dates where the linearly
+    # interpolated elevation crosses min_elevation
+    return (min_elevation - before) / (after - before)
+
+
+def _rises(elevation, min_elevation, stop):
+    # Fractional column of the last crossing of min_elevation upwards before
+    # the column stop of every row, or NaN
+    above = elevation > min_elevation
+    columns = np.arange(elevation.shape[1] - 1)
+    crossing = ~above[:, :-1] & above[:, 1:] & (columns < stop[:, None])
+    index = columns[-1] - np.argmax(crossing[:, ::-1], axis=1)
+    rows = np.arange(len(elevation))
+    return np.where(
+        crossing.any(axis=1),
+        index
+        + _crossing(elevation[rows, index], elevation[rows, index + 1], min_elevation),
+        np.nan,
+    )
+
+
+def _sets(elevation, min_elevation, start):
+    # Fractional column of the first crossing of min_elevation downwards
+    # after the column start of every row, or NaN
+    last = elevation.shape[1] - 1
+    return last - _rises(elevation[:, ::-1], min_elevation, last - start)
+
+
+def _pass_array(station, satellite, rise, culmination, set_, max_elevation, step):
+    passes = np.empty(len(station), dtype=PASS_DTYPE)
+    passes["station"] = station
+    passes["satellite"] = satellite
+    passes["max_elevation"] = max_elevation
+
+    # Fine dates to seconds since the start
+    seconds = np.timedelta64(step, "us") / np.timedelta64(1, "s")
+    passes["rise"] = rise * seconds
+    passes["culmination"] = culmination * seconds
+    passes["set"] = set_ * seconds
+    return np.sort(passes, order=["station", "satellite", "culmination"])
+
+
+def predict_passes(
+    backend,
+    tles,
+    stations,
+    start,
+    step,
+    count,
+    stride,
+    min_elevation=0.0,
+    screening_margin=math.radians(10.0),
+):
+    """Passes of the satellites of ``tles`` above ``min_elevation`` at ``stations``.
+
+    Searches the dates ``start + step * arange(count)`` coarse to fine:
+
+    * Satellites that `can_be_visible` from none of the stations
+      aren't propagated.
+    * The other ones are propagated to one date in every ``stride``, and
+      the runs of coarse dates above ``min_elevation - screening_margin``
+      are candidate passes. The margin catches the passes that peak
+      between coarse dates.
+    * Only the coarse intervals around the rise, culmination and set of
+      every candidate are refined to the ``step`` dates, interpolating the
+      coarse positions with `interpolation.hermite_interpolate`.
+
+    Returns a `PASS_DTYPE` array, sorted by station, satellite and date.
+    The rise and set times are linearly interpolated between the fine
+    dates.
+
+    """
+    stations_ecef, up = _topocentric(stations)
+    visible = can_be_visible(tles, stations, min_elevation)
+    (candidates,) = np.nonzero(visible.any(axis=0))
+    satellites = backend.pack(backend.build([tles[index] for index in candidates]))
+
+    # Refinements need the intervals before and after the coarse peaks
+    coarse_count = max(math.ceil((count - 1) / stride), 2) + 1
+    coarse_step = step * stride
+    e, r, v = backend.propagate_grid(
+        satellites, *backend.grid_times(start, coarse_step, coarse_count)
+    )
+    r, v = np.asarray(r), np.asarray(v)
+    r_ecef, _ = teme_to_ecef(r, v, *jday_from_grid(start, coarse_step, coarse_count))
+    jd, fr = jday_from_grid(start, step, (coarse_count - 1) * stride + 1)
+    node_step = np.timedelta64(coarse_step, "us") / np.timedelta64(1, "s")
+
+    # Station, row and coarse peak of every candidate pass, with the
+    # last coarse date below min_elevation up to the peak and the first
+    # one after it, or -1
+    candidate_passes = []
+    for station in range(len(stations)):
+        (rows,) = np.nonzero(visible[station, candidates])
+        elevation = _elevation(r_ecef[rows], stations_ecef[station], up[station])
+        with np.errstate(invalid="ignore"):
+            below = ~(elevation > min_elevation)
+
+        runs = _runs(elevation, min_elevation - screening_margin)
+        for row, peak in zip(runs[0], runs[3]):
+            (before,) = np.nonzero(below[row, : peak + 1])
+            (after,) = np.nonzero(below[row, peak:])
+            candidate_passes.append(
+                (
+                    station,
+                    rows[row],
+                    peak,
+                    before[-1] if len(before) else -1,
+                    peak + after[0] if len(after) else -1,
+                )
+            )
+    if not candidate_passes:
+        return np.empty(0, dtype=PASS_DTYPE)
+    station, row, peak, before, after = np.array(candidate_passes, dtype=np.intp).T
+
+    def refine(passes, first, intervals):
+        # Elevations at the fine dates of the coarse intervals from first
+        nodes = first[:, None] + np.arange(intervals + 1)
+        fine_r, fine_v = hermite_interpolate(
+            r[row[passes, None], nodes], v[row[passes, None], nodes], node_step, stride
+        )
+        dates = first[:, None] * stride + np.arange(intervals * stride + 1)
+        fine_r, _ = teme_to_ecef(fine_r, fine_v, jd[dates], fr[dates])
+        return _elevation(
+            fine_r, stations_ecef[station[passes], None], up[station[passes], None]
+        )
+
+    # Culminations, in the two coarse intervals around the coarse peaks
+    everything = np.arange(len(station))
+    culmination_first = np.clip(peak - 1, 0, coarse_count - 3)
+    elevation = refine(everything, culmination_first, 2)
+    fine_peak = np.argmax(np.nan_to_num(elevation, nan=-np.inf), axis=1)
+    max_elevation = elevation[everything, fine_peak]
+
+    # Passes that peak between coarse dates below min_elevation rise and
+    # set within the culmination intervals, the others in the coarse
+    # intervals where the coarse elevations cross min_elevation
+    rise = np.full(len(station), np.nan)
+    set_ = np.full(len(station), np.nan)
+    with np.errstate(invalid="ignore"):
+        inside = before == peak
+        rise[inside] = culmination_first[inside] * stride + _rises(
+            elevation[inside], min_elevation, fine_peak[inside]
+        )
+        set_[inside] = culmination_first[inside] * stride + _sets(
+            elevation[inside], min_elevation, fine_peak[inside]
+        )
+
+        (passes,) = np.nonzero(~inside & (before >= 0))
+        rise[passes] = before[passes] * stride + _rises(
+            refine(passes, before[passes], 1),
+            min_elevation,
+            np.full(len(passes), stride),
+        )
+        (passes,) = np.nonzero(~inside & (after >= 0))
+        set_[passes] = (after[passes] - 1) * stride + _sets(
+            refine(passes, after[passes] - 1, 1),
+            min_elevation,
+            np.zeros(len(passes), dtype=np.intp),
+        )
+
+        (passes,) = np.nonzero(max_elevation > min_elevation)
+    return _pass_array(
+        station[passes],
+        candidates[row[passes]],
+        rise[passes],
+        culmination_first[passes] * stride + fine_peak[passes],
+        set_[passes],
+        max_elevation[passes],
+        step,
+    )
+
+
+def predict_passes_dense(
+    backend, tles, stations, start, step, count, min_elevation=0.0, block_size=500
+):
+    """Brute force `predict_passes`, propagating every satellite to every date.
+
+    The satellites are propagated ``block_size`` at a time, to bound the
+    memory usage. Returns the same `PASS_DTYPE` array.
+
+    """
+    stations_ecef, up = _topocentric(stations)
+    jd, fr = jday_from_grid(start, step, count)
+
+    passes = []
+    for block in range(0, len(tles), block_size):
+        satellites = backend.pack(backend.build(tles[block : block + block_size]))
+        e, r, v = backend.propagate_grid(
+            satellites, *backend.grid_times(start, step, count)
+        )
+        r, _ = teme_to_ecef(np.asarray(r), np.asarray(v), jd, fr)
+        for station in range(len(stations)):
+            elevation = _elevation(r, stations_ecef[station], up[station])
+            rows, first, stop, peak = _runs(elevation, min_elevation)
+
+            # Crossings between the dates around the runs above min_elevation,
+            # unless they reach the first or the last date
+            last = np.minimum(stop, count - 1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                rise = (
+                    first
+                    - 1
+                    + _crossing(
+                        elevation[rows, first - 1],
+                        elevation[rows, first],
+                        min_elevation,
+                    )
+                )
+                set_ = (
+                    stop
+                    - 1
+                    + _crossing(
+                        elevation[rows, stop - 1], elevation[rows, last], min_elevation
+                    )
+                )
+            passes.append(
+                (
+                    np.full(len(rows), station),
+                    block + rows,
+                    np.where(first > 0, rise, np.nan),
+                    peak,
+                    np.where(stop < count, set_, np.nan),
+                    elevation[rows, peak],
+                )
+            )
+
+    return _pass_array(*map(np.concatenate, zip(*passes)), step)
@@ -0,0 +1,166 @@
+import collections
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+
+from memory import MemoryBenchmarkFixture
+
+PROFILERS = ("sampling", "cprofile")
+HOT_FUNCTIONS = 5
+
+
+def _frame_name(code):
+    return "{} ({}:{})".format(
+        code.co_name, os.path.basename(code.co_filename), code.co_firstlineno
+    )
+
+
+class SamplingProfiler:
+    """Sample the stack of the current thread from a background thread.
+
+    Extension code (like NumPy functions) counts as time of the Python
+    function that called it. The stacks only include the frames called by
+    `run`, and `collapsed` formats them like the ``stackcollapse`` scripts
+    of FlameGraph, also read by speedscope.
+
+    """
+
+    def __init__(self, interval=0.0005):
+        self.interval = interval
+        self.stacks = collections.Counter()
+
+    def run(self, function, *args, **kwargs):
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        sampler = threading.Thread(target=self._sample, daemon=True)
+
+        # Let the sampler take the GIL about as often as it samples
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(self.interval)
+        sampler.start()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self._stop.set()
+            sampler.join()
+            sys.setswitchinterval(switch_interval)
+
+    def _sample(self):
+        run_code = SamplingProfiler.run.__code__
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None and frame.f_code is not run_code:
+                stack.append(_frame_name(frame.f_code))
+                frame = frame.f_back
+            if frame is not None and stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def collapsed(self):
+        return [
+            "{} {}".format(";".join(stack), count)
+            for stack, count in sorted(self.stacks.items())
+        ]
+
+    def hot_functions(self, count=HOT_FUNCTIONS):
+        """The ``(function, share)`` of the samples with the most self time."""
+        total = sum(self.stacks.values())
+        self_samples = collections.Counter()
+        for stack, samples in self.stacks.items():
+            self_samples[stack[-1]] += samples
+        return [
+            (function, samples / total)
+            for function, samples in self_samples.most_common(count)
+        ]
+
+
+def profile_call(function, args, kwargs, profiler, path, min_time=1.0):
+    """Profile ``function``, saving the profile to ``path`` plus an extension.
+
+    The ``"cprofile"`` profiler calls ``function`` once and saves
+    a ``.pstats`` file. The ``"sampling"`` profiler calls it until
+    ``min_time`` seconds have passed, so that short calls get enough
+    samples, and saves a ``.collapsed`` file of stacks for flame graphs.
+
+    Returns the `HOT_FUNCTIONS` functions with most self time,
+    as ``(function, share)`` tuples.
+
+    """
+    if profiler == "cprofile":
+        profile = cProfile.Profile()
+        profile.runcall(function, *args, **kwargs)
+        profile.dump_stats(path + ".pstats")
+
+        stats = pstats.Stats(profile)
+        total = sum(tottime for _, _, tottime, _, _ in stats.stats.values())
+        hot = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        return [
+            (
+                "{} ({}:{})".format(name, os.path.basename(filename), line),
+                tottime / total if total else 0.0,
+            )
+            for (filename, line, name), (_, _, tottime, _, _) in hot[:HOT_FUNCTIONS]
+        ]
+
+    sampler = SamplingProfiler()
+
+    def repeat():
+        start = time.perf_counter()
+        while True:
+            function(*args, **kwargs)
+            if time.perf_counter() - start >= min_time:
+                break
+
+    sampler.run(repeat)
+    with open(path + ".collapsed", "w") as collapsed:
+        collapsed.writelines(line + "\n" for line in sampler.collapsed())
+
+    return sampler.hot_functions()
+
+
+class ProfilingBenchmarkFixture(MemoryBenchmarkFixture):
+    """pytest-benchmark fixture that also profiles the benchmarked function.
+
+    Like the memory instrumentation, this covers `pedantic` benchmarks too.
+    After the timed rounds (and the memory instrumentation, if enabled)
+    the function is profiled with `profile_call`. The profile is saved in
+    ``profile_dir``, named after the test, and the hot functions are stored
+    in ``extra_info``.
+
+    """
+
+    @classmethod
+    def from_fixture(cls, benchmark, records, profiler, profile_dir, profiles):
+        benchmark = super().from_fixture(benchmark, records)
+        benchmark.profiler = profiler
+        benchmark.profile_dir = profile_dir
+        benchmark.profiles = profiles
+        return benchmark
+
+    def _instrumented(self, result, function, arguments):
+        result = super()._instrumented(result, function, arguments)
+        if not self.disabled:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(
+                self.profile_dir, re.sub(r"[^\w.\[\]-]+", "_", self.fullname)
+            )
+            args, kwargs = arguments()
+            hot_functions = profile_call(function, args, kwargs, self.profiler, path)
+            self.extra_info["hot_functions"] = hot_functions
+            self.profiles.append((self.fullname, hot_functions))
+
+        return result
+
+
+def format_hot_functions(profiles):
+    lines = []
+    for name, hot_functions in profiles:
+        lines.append(name)
+        for function, share in hot_functions:
+            lines.append("  {:>6.1%}  {}".format(share, function))
+
+    return lines
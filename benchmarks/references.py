@@ -0,0 +1,106 @@
+"""Reference ephemerides of the benchmarks, stored in compressed ``.npz`` files.
+
+To regenerate them after changing their inputs, run::
+
+    python benchmarks/references.py [NAME ...]
+
+"""
+import argparse
+import datetime as dt
+import functools
+import hashlib
+import os
+
+import numpy as np
+from sgp4.model import Satrec, SatrecArray, WGS72
+
+from epochs import jday_from_epochs
+
+REFERENCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "references")
+
+TLE = (
+    "1 41557U 16033B   20345.20030338  .00003290  00000-0  12071-3 0  9996",
+    "2 41557  97.3998  74.3002 0013100 179.2679 265.4184 15.28602096252616",
+)
+
+# TLEs and epochs of every reference
+INPUTS = {
+    "multiple_dates_medium": (
+        [TLE],
+        [dt.datetime(2020, 12, 11, 12, 0, minute) for minute in range(60)]
+        + [dt.datetime(2020, 12, 11, 12, hour, 0) for hour in range(1, 24)]
+        + [dt.datetime(2020, 12, day, 0, 0, 0) for day in range(13, 31)],
+    ),
+}
+
+
+def inputs_digest(tles, epochs):
+    digest = hashlib.sha256()
+    for line1, line2 in tles:
+        digest.update((line1 + line2).encode("ascii"))
+    for epoch in epochs:
+        digest.update(epoch.isoformat().encode("ascii"))
+    return digest.hexdigest()
+
+
+def reference_path(name):
+    return os.path.join(REFERENCES_DIR, name + ".npz")
+
+
+@functools.lru_cache(maxsize=None)
+def load_reference(name):
+    """Return the ``(tles, epochs, rs, vs)`` of the reference ``name``.
+
+    The file is only read on the first call, and ``rs`` and ``vs``, with
+    shape ``(len(tles), len(epochs), 3)``, are read-only because they are
+    shared between calls.
+
+    """
+    tles, epochs = INPUTS[name]
+    with np.load(reference_path(name)) as reference:
+        if reference["digest"] != inputs_digest(tles, epochs):
+            raise ValueError(
+                "Reference {0!r} is outdated, regenerate it with "
+                "`python benchmarks/references.py {0}`".format(name)
+            )
+        rs, vs = reference["r"], reference["v"]
+
+    rs.flags.writeable = vs.flags.writeable = False
+    return tles, epochs, rs, vs
+
+
+def generate_reference(name):
+    """Propagate the inputs of ``name`` with the pure Python `sgp4` and save them."""
+    tles, epochs = INPUTS[name]
+    satrec_array = SatrecArray([Satrec.twoline2rv(*tle, WGS72) for tle in tles])
+    e, r, v = satrec_array.sgp4(*jday_from_epochs(epochs))
+    if np.any(e):
+        raise ValueError("Propagation errors in reference {!r}".format(name))
+
+    os.makedirs(REFERENCES_DIR, exist_ok=True)
+    np.savez_compressed(
+        reference_path(name), r=r, v=v, digest=inputs_digest(tles, epochs)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate reference ephemerides.")
+    parser.add_argument(
+        "names",
+        nargs="*",
+        help="References to regenerate, among {} (default: all of them).".format(
+            ", ".join(sorted(INPUTS))
+        ),
+    )
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(INPUTS)
+    if unknown:
+        parser.error("unknown references: {}".format(", ".join(sorted(unknown))))
+
+    for name in args.names or sorted(INPUTS):
+        generate_reference(name)
+        print("Wrote", reference_path(name))
+
+
+if __name__ == "__main__":
+    main()
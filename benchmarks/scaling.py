@@ -0,0 +1,114 @@
+import time
+
+import numpy as np
+
+# An exponent above this in the cost of n·m propagations is super-linear
+SUPER_LINEAR_EXPONENT = 1.1
+# A fixed cost per call above this many propagations is a large overhead
+LARGE_OVERHEAD_PROPAGATIONS = 1000
+# Timed calls of the serial baselines of the strong scaling benchmarks
+SERIAL_ROUNDS = 3
+
+
+def fit_scaling(sizes, times):
+    """Fit the time of every call to its number of propagations.
+
+    Returns a dictionary with:
+
+    * ``overhead``: fixed cost per call in seconds, and ``per_propagation``
+      the cost of every propagation, from fitting ``overhead +
+      per_propagation * size`` with relative errors, so that every size
+      weighs the same.
+    * ``exponent``: slope of ``log(time)`` against ``log(size)`` for the
+      larger half of the sizes, where the fixed overhead matters less.
+    * ``super_linear`` and ``large_overhead``: whether the backend should
+      be looked at, with the thresholds defined in this module.
+
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    times = np.asarray(times, dtype=float)
+
+    design = np.stack([np.ones_like(sizes), sizes], axis=1) / times[:, None]
+    (overhead, per_propagation), *_ = np.linalg.lstsq(
+        design, np.ones_like(times), rcond=None
+    )
+
+    larger = sizes >= np.median(sizes)
+    if len(np.unique(sizes[larger])) > 1:
+        exponent = np.polyfit(np.log(sizes[larger]), np.log(times[larger]), 1)[0]
+    else:
+        exponent = np.nan
+
+    return {
+        "overhead": float(overhead),
+        "per_propagation": float(per_propagation),
+        "exponent": float(exponent),
+        "super_linear": bool(exponent > SUPER_LINEAR_EXPONENT),
+        "large_overhead": bool(
+            overhead > LARGE_OVERHEAD_PROPAGATIONS * per_propagation
+        ),
+    }
+
+
+def fit_scaling_records(records):
+    """Fit the ``(backend, n, m, time)`` records of every backend."""
+    by_backend = {}
+    for name, n, m, elapsed in records:
+        by_backend.setdefault(name, []).append((n * m, elapsed))
+
+    return {
+        name: fit_scaling(*zip(*points))
+        for name, points in sorted(by_backend.items())
+        if len(points) > 1
+    }
+
+
+def format_scaling_table(fits):
+    lines = [
+        "{:<20}  {:>14}  {:>18}  {:>8}  {}".format(
+            "Backend", "Overhead (us)", "Propagation (ns)", "Exponent", "Flags"
+        )
+    ]
+    for name, fit in fits.items():
+        flags = [flag for flag in ("super_linear", "large_overhead") if fit[flag]]
+        lines.append(
+            "{:<20}  {:>14.2f}  {:>18.2f}  {:>8.2f}  {}".format(
+                name,
+                fit["overhead"] * 1e6,
+                fit["per_propagation"] * 1e9,
+                fit["exponent"],
+                ", ".join(flags),
+            )
+        )
+
+    return lines
+
+
+def min_time(function, *args, rounds=SERIAL_ROUNDS):
+    """Shortest time in seconds of ``rounds`` calls of ``function(*args)``."""
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def record_strong_scaling(benchmark, count, serial, unit="workers"):
+    """Store ``count`` workers (or threads) and the speedup in ``extra_info``.
+
+    The speedup and efficiency are relative to the same run with
+    ``count = 1``, whose time in seconds ``serial()`` measures, for example
+    with `min_time`. It is only called for counts above 1, and not at all
+    with ``--benchmark-disable``.
+
+    """
+    benchmark.extra_info[unit] = count
+    if benchmark.stats is None:  # --benchmark-disable
+        return
+
+    elapsed = benchmark.stats.stats.min
+    speedup = (elapsed if count == 1 else serial()) / elapsed
+    benchmark.extra_info["speedup"] = speedup
+    benchmark.extra_info["efficiency"] = speedup / count
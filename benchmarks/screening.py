@@ -0,0 +1,92 @@
+import numpy as np
+
+# Cell coordinates are packed in 21 bits each, enough for ±10^6 cells
+CELL_BITS = 21
+CELL_BIAS = 1 << (CELL_BITS - 1)
+
+# Columns of cells along z to compare with the column of every cell:
+# its own, and half of its 8 neighbors, so that every pair is visited once
+COLUMN_OFFSETS = [(0, 0), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def _cell_keys(cells):
+    # Sorting the keys sorts the cells by column, then along z
+    biased = cells + CELL_BIAS
+    return (
+        (biased[:, 0] << (2 * CELL_BITS)) | (biased[:, 1] << CELL_BITS) | biased[:, 2]
+    )
+
+
+def close_pairs(positions, threshold):
+    """Pairs of ``positions`` (shape ``(n, 3)``) closer than ``threshold``.
+
+    The positions are hashed into cubic cells of side ``threshold`` and
+    sorted by cell, so that only the points of the same and of neighboring
+    cells are compared, instead of all the pairs. The neighbors of a cell
+    along z are contiguous in the sorted cells, and are found with one
+    binary search per column of neighbors. Positions with NaN are ignored.
+    Returns the ``(i, j, distance)`` arrays of the pairs, with ``i < j``.
+
+    """
+    (valid,) = np.nonzero(np.isfinite(positions).all(axis=1))
+    keys = _cell_keys(np.floor(positions[valid] / threshold).astype(np.int64))
+    order = np.argsort(keys)
+    keys = keys[order]
+    positions = positions[valid[order]]
+    points = np.arange(len(keys))
+
+    first, second = [], []
+    for dx, dy in COLUMN_OFFSETS:
+        # Range of the sorted points in the cells from z - 1 to z + 1 of the
+        # neighbor column, searched with sorted keys, which is faster
+        column = keys + (dx << (2 * CELL_BITS)) + (dy << CELL_BITS)
+        stop = np.searchsorted(keys, column + 1, side="right")
+        if (dx, dy) == (0, 0):
+            # Only the points after the point itself in its own column
+            start = points + 1
+        else:
+            start = np.searchsorted(keys, column - 1, side="left")
+
+        counts = np.maximum(stop - start, 0)
+        total = counts.sum()
+        if not total:
+            continue
+        # Position of every candidate within the range of its point
+        within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        first.append(np.repeat(points, counts))
+        second.append(np.repeat(start, counts) + within)
+
+    if not first:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0)
+
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+    distance = np.linalg.norm(positions[first] - positions[second], axis=1)
+    close = distance < threshold
+    i, j = valid[order[first[close]]], valid[order[second[close]]]
+    return np.minimum(i, j), np.maximum(i, j), distance[close]
+
+
+def screen_conjunctions(r, threshold):
+    """Close approaches in the positions ``r`` of shape ``(n, m, 3)``.
+
+    Runs `close_pairs` on every one of the ``m`` dates, and returns
+    the ``(date, i, j, distance)`` arrays of the pairs of satellites
+    ``i < j`` closer than ``threshold`` at each date.
+
+    """
+    dates, first, second, distances = [], [], [], []
+    for date in range(r.shape[1]):
+        i, j, distance = close_pairs(r[:, date], threshold)
+        dates.append(np.full(len(i), date))
+        first.append(i)
+        second.append(j)
+        distances.append(distance)
+
+    return (
+        np.concatenate(dates),
+        np.concatenate(first),
+        np.concatenate(second),
+        np.concatenate(distances),
+    )
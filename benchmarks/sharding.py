@@ -0,0 +1,329 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from backends import BACKENDS
+from streaming import tile_bounds
+
+# Satellites per task of `StealingPropagator`
+TASK_SIZE = 32
+
+
+def worker_counts(max_workers=None):
+    """Powers of two up to ``max_workers`` (by default, the number of CPUs)."""
+    max_workers = max_workers or os.cpu_count()
+    counts = {max_workers}
+    workers = 1
+    while workers < max_workers:
+        counts.add(workers)
+        workers *= 2
+    return sorted(counts)
+
+
+def shard_bounds(n, shards):
+    edges = np.linspace(0, n, shards + 1).astype(int)
+    return [
+        (int(start), int(stop))
+        for start, stop in zip(edges[:-1], edges[1:])
+        if stop > start
+    ]
+
+
+def shared_tempdir():
+    # /dev/shm is a tmpfs on Linux, so the output never touches the disk
+    return tempfile.mkdtemp(
+        prefix="sgp4-benchmarks-",
+        dir="/dev/shm" if os.path.isdir("/dev/shm") else None,
+    )
+
+
+class ShardedPropagator:
+    """Propagate ``tles`` to ``epochs`` splitting the satellites across processes.
+
+    Each worker process owns a contiguous shard of satellites, builds them
+    once, and on every `propagate` call writes its rows of ``e``, ``r``
+    and ``v`` into memory-mapped output arrays shared with the parent
+    process, with `backends.Backend.propagate_into`, so no results are
+    pickled back.
+
+    Multithreaded backends are limited to ``threads_per_worker`` threads
+    in every worker. Workers are spawned rather than forked, because forking
+    after a backend has started its OpenMP threads (like cysgp4 does)
+    can deadlock.
+
+    """
+
+    # Workers are spawned rather than forked, see above
+    _context = multiprocessing.get_context("spawn")
+
+    def __init__(self, backend, tles, epochs, workers, threads_per_worker=1):
+        self.shards = shard_bounds(len(tles), workers)
+        self.error_codes = backend.error_codes
+        paths, outputs = self._allocate(len(tles), len(epochs))
+        self._start(
+            _worker,
+            [
+                (
+                    backend.name,
+                    tles[start:stop],
+                    epochs,
+                    (start, stop),
+                    paths,
+                    outputs,
+                    threads_per_worker,
+                )
+                for start, stop in self.shards
+            ],
+        )
+
+    def _allocate(self, n, m):
+        # Memory-mapped outputs, returning the paths and the shapes and
+        # dtypes the workers need to map them
+        self._tmpdir = shared_tempdir()
+        outputs = {
+            "e": ((n, m), np.uint8),
+            "r": ((n, m, 3), np.float64),
+            "v": ((n, m, 3), np.float64),
+        }
+        paths = {key: os.path.join(self._tmpdir, key) for key in outputs}
+        self.e, self.r, self.v = (
+            np.memmap(paths[key], dtype=dtype, mode="w+", shape=shape)
+            for key, (shape, dtype) in outputs.items()
+        )
+        return paths, outputs
+
+    def _start(self, target, worker_args):
+        # One worker process per tuple of arguments, each with a pipe
+        self._connections = []
+        self._processes = []
+        for args in worker_args:
+            connection, child_connection = self._context.Pipe()
+            process = self._context.Process(
+                target=target, args=(child_connection, *args), daemon=True
+            )
+            process.start()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+        try:
+            self._wait()
+        except BaseException:
+            self.close()
+            raise
+
+    def _wait(self):
+        # The results the workers send, raising the first error
+        results = [connection.recv() for connection in self._connections]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def propagate(self):
+        """Return memory-mapped ``(e, r, v)``, valid until `close` is called.
+
+        Like `backends.Backend.propagate_many`, ``e`` is None for backends
+        without error codes, rather than the untouched zeros of its buffer.
+
+        """
+        for connection in self._connections:
+            connection.send(True)
+        self._wait()
+
+        return self._results()
+
+    def _results(self):
+        return (self.e if self.error_codes else None), self.r, self.v
+
+    def close(self):
+        for connection, process in zip(self._connections, self._processes):
+            try:
+                connection.send(False)
+            except OSError:  # The worker already exited
+                pass
+            process.join()
+            connection.close()
+        self._connections, self._processes = [], []
+
+        # The mappings stay valid while any array still references them
+        shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _limit_threads(threads):
+    # Keep multithreaded backends from oversubscribing the cores
+    for variable in ("OMP_NUM_THREADS", "NUMBA_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+
+
+def _open_outputs(paths, outputs):
+    return (
+        np.memmap(paths[key], dtype=dtype, mode="r+", shape=shape)
+        for key, (shape, dtype) in outputs.items()
+    )
+
+
+def _worker(connection, backend_name, tles, epochs, bounds, paths, outputs, threads):
+    _limit_threads(threads)
+
+    start, stop = bounds
+    try:
+        backend = BACKENDS[backend_name]
+        backend.load()
+        args = backend.prepare_many(backend.build(tles), epochs)
+        out = tuple(array[start:stop] for array in _open_outputs(paths, outputs))
+    except Exception as exc:
+        connection.send(exc)
+        return
+    connection.send(None)
+
+    while connection.recv():
+        try:
+            backend.propagate_into(*args, out=out)
+        except Exception as exc:
+            connection.send(exc)
+        else:
+            connection.send(None)
+
+
+class StealingPropagator(ShardedPropagator):
+    """Propagate ``tles`` to ``epochs`` in small tasks balanced by work stealing.
+
+    The satellites are split into tasks of ``task_size`` satellites, dealt
+    in contiguous runs to one deque per worker process, like the shards of
+    `ShardedPropagator`. Every worker takes the tasks at the front of its
+    deque, and once it is empty, steals the last task of the fullest one,
+    so that workers with cheaper satellites (near earth, or failing early)
+    help those with deep space ones. The deques are index ranges in shared
+    memory, guarded by one lock, and the workers write the rows of their
+    tasks into memory-mapped output arrays with
+    `backends.Backend.propagate_into`.
+
+    After every `propagate` call, ``busy`` holds the seconds every worker
+    spent propagating and ``steals`` the number of tasks it stole.
+
+    """
+
+    def __init__(
+        self, backend, tles, epochs, workers, threads_per_worker=1, task_size=TASK_SIZE
+    ):
+        self.tasks = tile_bounds(len(tles), task_size)
+        self.error_codes = backend.error_codes
+        self.workers = workers
+        self.busy = [0.0] * workers
+        self.steals = [0] * workers
+        # Head and tail of the deque of tasks of every worker
+        self._deques = self._context.Array("q", 2 * workers)
+        paths, outputs = self._allocate(len(tles), len(epochs))
+        self._start(
+            _stealing_worker,
+            [
+                (
+                    backend.name,
+                    tles,
+                    epochs,
+                    self.tasks,
+                    worker,
+                    self._deques,
+                    paths,
+                    outputs,
+                    threads_per_worker,
+                )
+                for worker in range(workers)
+            ],
+        )
+
+    def propagate(self):
+        """Return memory-mapped ``(e, r, v)``, valid until `close` is called."""
+        with self._deques.get_lock():
+            deques = self._deques.get_obj()
+            deques[:] = [0] * len(deques)
+            for worker, (start, stop) in enumerate(
+                shard_bounds(len(self.tasks), self.workers)
+            ):
+                deques[2 * worker] = start
+                deques[2 * worker + 1] = stop
+
+        for connection in self._connections:
+            connection.send(True)
+        self.busy, self.steals = map(list, zip(*self._wait()))
+
+        return self._results()
+
+
+def _next_task(deques, worker):
+    # Index of the next task of the worker and whether it was stolen,
+    # or None once all the deques are empty
+    with deques.get_lock():
+        deques = deques.get_obj()
+        head, tail = deques[2 * worker], deques[2 * worker + 1]
+        if head < tail:
+            deques[2 * worker] = head + 1
+            return head, False
+
+        remaining = [tail - head for head, tail in zip(deques[::2], deques[1::2])]
+        victim = max(range(len(remaining)), key=remaining.__getitem__)
+        if remaining[victim] <= 0:
+            return None, False
+        deques[2 * victim + 1] -= 1
+        return deques[2 * victim + 1], True
+
+
+def _stealing_worker(
+    connection,
+    backend_name,
+    tles,
+    epochs,
+    tasks,
+    worker,
+    deques,
+    paths,
+    outputs,
+    threads,
+):
+    _limit_threads(threads)
+
+    try:
+        backend = BACKENDS[backend_name]
+        backend.load()
+        # Any worker may run any task
+        satellites = backend.build(tles)
+        batches = [backend.pack(satellites[start:stop]) for start, stop in tasks]
+        times = backend.times(epochs)
+        e, r, v = _open_outputs(paths, outputs)
+    except Exception as exc:
+        connection.send(exc)
+        return
+    connection.send(None)
+
+    while connection.recv():
+        busy = 0.0
+        steals = 0
+        try:
+            while True:
+                task, stolen = _next_task(deques, worker)
+                if task is None:
+                    break
+
+                start, stop = tasks[task]
+                begin = time.perf_counter()
+                backend.propagate_into(
+                    batches[task],
+                    *times,
+                    out=(e[start:stop], r[start:stop], v[start:stop])
+                )
+                busy += time.perf_counter() - begin
+                steals += stolen
+        except Exception as exc:
+            connection.send(exc)
+        else:
+            connection.send((busy, steals))
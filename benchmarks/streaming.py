@@ -0,0 +1,25 @@
+def tile_bounds(n, size):
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def propagate_tiles(backend, satellites, epochs, tile_shape):
+    """Propagate ``satellites`` to ``epochs`` one satellites × epochs tile at a time.
+
+    Yields ``(satellites_slice, epochs_slice), (e, r, v)`` for tiles
+    of at most ``tile_shape = (satellites_per_tile, epochs_per_tile)``,
+    so that peak memory depends on the tile shape and not on the size of
+    the whole problem. Tiles are yielded satellite-major.
+
+    """
+    satellites_per_tile, epochs_per_tile = tile_shape
+    epoch_tiles = [
+        (slice(start, stop), backend.times(epochs[start:stop]))
+        for start, stop in tile_bounds(len(epochs), epochs_per_tile)
+    ]
+
+    for start, stop in tile_bounds(len(satellites), satellites_per_tile):
+        batch = backend.pack(satellites[start:stop])
+        for epochs_slice, times in epoch_tiles:
+            yield (slice(start, stop), epochs_slice), backend.propagate_many(
+                batch, *times
+            )
@@ -0,0 +1,135 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+from sgp4.api import Satrec, SatrecArray
+
+from epochs import jday_from_epochs
+
+
+def assert_states_close(actual, expected, rtol):
+    # Relative to the length of the vectors, since their components cross
+    # zero, and NaN for the same satellites and dates
+    assert_array_equal(np.isnan(actual), np.isnan(expected))
+    scale = np.linalg.norm(expected, axis=-1, keepdims=True)
+    assert_allclose(actual / scale, expected / scale, rtol=0, atol=rtol)
+
+
+def test_single_satellite_single_date(
+    backend, single_satellite_single_date_data, benchmark
+):
+    tle, epoch, expected_r, expected_v = single_satellite_single_date_data
+
+    (satellite,) = backend.build([tle])
+    args = backend.prepare_single(satellite, epoch)
+
+    e, r, v = benchmark(backend.propagate_single, *args)
+    backend.teardown(args)
+
+    if e is not None:
+        assert_allclose(e, 0)
+    assert r == pytest.approx(expected_r)
+    assert v == pytest.approx(expected_v)
+
+
+def test_single_satellite_multiple_dates_medium(
+    backend, single_satellite_multiple_dates_data_medium, benchmark
+):
+    tle, epochs, expected_rs, expected_vs = single_satellite_multiple_dates_data_medium
+
+    (satellite,) = backend.build([tle])
+    args = backend.prepare_array(satellite, epochs)
+
+    e, r, v = benchmark(backend.propagate_array, *args)
+    backend.teardown(args)
+
+    if e is not None:
+        assert_allclose(e, 0)
+    assert_allclose(r, expected_rs, rtol=backend.rtol)
+    assert_allclose(v, expected_vs, rtol=backend.rtol)
+
+
+def test_single_satellite_multiple_dates_large(
+    backend, single_satellite_multiple_dates_data_large, benchmark
+):
+    tle, epochs, expected_shape = single_satellite_multiple_dates_data_large
+
+    (satellite,) = backend.build([tle])
+    args = backend.prepare_array(satellite, epochs)
+
+    e, r, v = benchmark(backend.propagate_array, *args)
+    backend.teardown(args)
+
+    if e is not None:
+        assert_allclose(e, 0)
+    assert r.shape == expected_shape
+    assert v.shape == expected_shape
+
+
+def test_multiple_satellites_multiple_dates_medium(
+    backend, multiple_satellites_multiple_dates_data_medium, benchmark
+):
+    (
+        tles,
+        epochs,
+        expected_rs,
+        expected_vs,
+    ) = multiple_satellites_multiple_dates_data_medium
+
+    satellites = backend.build(tles)
+    args = backend.prepare_many(satellites, epochs)
+
+    e, r, v = benchmark(backend.propagate_many, *args)
+    backend.teardown(args)
+
+    if e is not None:
+        assert_allclose(e, 0)
+    assert_allclose(r, expected_rs, rtol=backend.rtol)
+    assert_allclose(v, expected_vs, rtol=backend.rtol)
+
+
+def test_multiple_satellites_multiple_dates_large(
+    backend, multiple_satellites_multiple_dates_data_large, benchmark
+):
+    tles, epochs, expected_shape = multiple_satellites_multiple_dates_data_large
+
+    satellites = backend.build(tles)
+    args = backend.prepare_many(satellites, epochs)
+
+    e, r, v = benchmark(backend.propagate_many, *args)
+    backend.teardown(args)
+
+    if e is not None:
+        assert_allclose(e, 0)
+    assert r.shape == expected_shape
+    assert v.shape == expected_shape
+
+
+def test_multiple_satellites_catalog(backend, multiple_satellites_catalog_data):
+    tles, epochs = multiple_satellites_catalog_data
+    satrecs = [Satrec.twoline2rv(*tle) for tle in tles]
+    if not backend.deep_space:
+        tles, satrecs = zip(
+            *[
+                (tle, satrec)
+                for tle, satrec in zip(tles, satrecs)
+                if satrec.method == "n"
+            ]
+        )
+    rtol = backend.rtol
+    if any(satrec.method == "d" for satrec in satrecs):
+        rtol = max(rtol, backend.deep_space_rtol)
+    # The C++ implementation of the reference, with its error codes
+    expected_e, expected_rs, expected_vs = SatrecArray(satrecs).sgp4(
+        *jday_from_epochs(epochs)
+    )
+
+    satellites = backend.build(tles)
+    args = backend.prepare_many(satellites, epochs)
+
+    e, r, v = backend.propagate_many(*args)
+    backend.teardown(args)
+
+    if e is not None and np.ndim(e) == 2:
+        assert_array_equal(e, expected_e)
+    assert_states_close(r, expected_rs, rtol)
+    assert_states_close(v, expected_vs, rtol)
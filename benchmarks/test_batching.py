@@ -0,0 +1,83 @@
+import asyncio
+
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from batching import MicroBatcher, serve_load
+
+# Seconds the first request of a batch waits for others,
+# with None for one propagation per request
+WINDOWS = {"unbatched": None, "0ms": 0.0, "0.5ms": 0.0005, "2ms": 0.002}
+CONCURRENCIES = [1, 32, 256]
+ROUNDS = 3
+
+
+def test_multiple_satellites_multiple_dates_medium_batching(
+    backend, multiple_satellites_multiple_dates_data_medium
+):
+    (
+        tles,
+        epochs,
+        expected_rs,
+        expected_vs,
+    ) = multiple_satellites_multiple_dates_data_medium
+    satellites = backend.build(tles)
+    rng = np.random.default_rng(42)
+    requests = [
+        (satellite, date)
+        for satellite in range(len(tles))
+        for date in rng.choice(len(epochs), size=3, replace=False)
+    ]
+
+    async def propagate_all():
+        async with MicroBatcher(backend, satellites, max_batch=64) as batcher:
+            return await asyncio.gather(
+                *(
+                    batcher.propagate(satellite, epochs[date])
+                    for satellite, date in requests
+                )
+            )
+
+    results = asyncio.run(propagate_all())
+
+    for (satellite, date), (e, r, v) in zip(requests, results):
+        if e is not None:
+            assert e == 0
+        assert_allclose(r, expected_rs[satellite, date], rtol=backend.rtol)
+        assert_allclose(v, expected_vs[satellite, date], rtol=backend.rtol)
+
+
+@pytest.mark.parametrize("concurrency", CONCURRENCIES)
+@pytest.mark.parametrize("window", list(WINDOWS.values()), ids=list(WINDOWS))
+def test_multiple_satellites_requests_batching(
+    backend, window, concurrency, multiple_satellites_requests_data, benchmark
+):
+    tles, requests = multiple_satellites_requests_data
+    satellites = backend.build(tles)
+    if window is None:
+        window, max_batch = 0.0, 1
+    else:
+        max_batch = 1024
+
+    served = []
+
+    def serve_round():
+        served.append(
+            serve_load(backend, satellites, requests, concurrency, window, max_batch)
+        )
+
+    benchmark.pedantic(serve_round, rounds=ROUNDS)
+
+    # Only the timed rounds, before the extra call of the memory usage
+    latencies = np.concatenate([latencies for latencies, _ in served[:ROUNDS]])
+    batch_sizes = np.concatenate([sizes for _, sizes in served[:ROUNDS]])
+    for _, sizes in served[:ROUNDS]:
+        assert sum(sizes) == len(requests)
+    benchmark.extra_info["p50_latency"] = np.percentile(latencies, 50)
+    benchmark.extra_info["p99_latency"] = np.percentile(latencies, 99)
+    benchmark.extra_info["mean_batch_size"] = np.mean(batch_sizes)
+    if benchmark.stats is not None:
+        benchmark.extra_info["requests_per_second"] = (
+            len(requests) / benchmark.stats.stats.min
+        )
@@ -0,0 +1,42 @@
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+from sgp4.model import Satrec, SatrecArray, WGS72
+
+from broadcast import SatelliteArrays, sgp4_broadcast
+from epochs import jday_from_epochs
+
+
+def test_satellite_arrays_rejects_deep_space(
+    multiple_satellites_multiple_dates_large_mixed_data,
+):
+    tles, _ = multiple_satellites_multiple_dates_large_mixed_data
+    satrecs = [Satrec.twoline2rv(*tle, WGS72) for tle in tles]
+    deep_space = [index for index, satrec in enumerate(satrecs) if satrec.method == "d"]
+
+    with pytest.raises(ValueError) as excinfo:
+        SatelliteArrays.from_satrecs(satrecs)
+    assert str(excinfo.value) == "Deep space satellites are not supported: {}".format(
+        deep_space
+    )
+
+
+def test_sgp4_broadcast_simplified_drag(
+    multiple_satellites_multiple_dates_large_mixed_data,
+):
+    tles, epochs = multiple_satellites_multiple_dates_large_mixed_data
+    # The decaying orbits of the catalog, with the simplified drag model
+    satrecs = [Satrec.twoline2rv(*tle, WGS72) for tle in tles]
+    satrecs = [
+        satrec for satrec in satrecs if satrec.method == "n" and satrec.isimp == 1
+    ]
+    jd, fr = jday_from_epochs(epochs)
+    expected_e, expected_rs, expected_vs = SatrecArray(satrecs).sgp4(jd, fr)
+
+    e, r, v = sgp4_broadcast(SatelliteArrays.from_satrecs(satrecs), jd, fr)
+
+    # Some dates are propagated, and the others fail
+    assert satrecs
+    assert (expected_e == 0).any() and (expected_e != 0).any()
+    assert_array_equal(e, expected_e)
+    assert_allclose(r, expected_rs, rtol=1e-7)
+    assert_allclose(v, expected_vs, rtol=1e-7)
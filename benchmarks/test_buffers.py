@@ -0,0 +1,68 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+# No output arrays, contiguous ones, or strided views of bigger buffers
+OUTPUTS = ["allocate", "out", "strided"]
+
+
+def output_arrays(backend, output, n, m):
+    if output != "allocate" and not backend.writes_out:
+        pytest.skip("{} can't write into output arrays".format(backend.name))
+    if output == "strided" and not backend.strided_out:
+        pytest.skip("{} can't write into strided arrays".format(backend.name))
+
+    if output == "allocate":
+        return None
+    if output == "out":
+        return (
+            np.empty((n, m), dtype=np.uint8),
+            np.empty((n, m, 3)),
+            np.empty((n, m, 3)),
+        )
+
+    # Positions and velocities interleaved in one (n, m, 6) state buffer
+    states = np.empty((n, m, 6))
+    flags = np.empty((n, m, 2), dtype=np.uint8)
+    return flags[..., 0], states[..., :3], states[..., 3:]
+
+
+@pytest.mark.parametrize("output", OUTPUTS)
+def test_multiple_satellites_multiple_dates_medium_out(
+    backend, output, multiple_satellites_multiple_dates_data_medium
+):
+    (
+        tles,
+        epochs,
+        expected_rs,
+        expected_vs,
+    ) = multiple_satellites_multiple_dates_data_medium
+    satellites, *times = backend.prepare_many(backend.build(tles), epochs)
+    out = output_arrays(backend, output, len(tles), len(epochs))
+
+    e, r, v = backend.propagate_many(satellites, *times, out=out)
+
+    if out is not None:
+        assert r is out[1] and v is out[2]
+    if e is not None:
+        assert_allclose(e, 0)
+    assert_allclose(r, expected_rs, rtol=backend.rtol)
+    assert_allclose(v, expected_vs, rtol=backend.rtol)
+
+
+@pytest.mark.parametrize("output", OUTPUTS)
+def test_multiple_satellites_tracking_out(
+    backend, output, multiple_satellites_tracking_data, benchmark
+):
+    tles, epochs = multiple_satellites_tracking_data
+    args = backend.prepare_many(backend.build(tles), epochs)
+    out = output_arrays(backend, output, len(tles), len(epochs))
+
+    e, r, v = benchmark(backend.propagate_many, *args, out=out)
+    backend.teardown(args)
+
+    assert np.isfinite(r).all()
+    if benchmark.stats is not None:
+        benchmark.extra_info["propagations_per_second"] = (
+            len(tles) * len(epochs) / benchmark.stats.stats.min
+        )
@@ -0,0 +1,148 @@
+import os
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+import sgp4
+from sgp4.api import WGS72, WGS84
+
+from cache import EphemerisCache, SatrecCache
+from catalog import catalog_tles, checksum, parse_catalog
+
+
+@pytest.mark.parametrize("cache_state", ["cold", "warm"])
+def test_catalog_startup(backend, cache_state, catalog_data, tmp_path, benchmark):
+    text, size, epoch = catalog_data
+    cache = SatrecCache(str(tmp_path))
+
+    try:
+        backend.restore(cache.load(parse_catalog(text), WGS72))
+    except NotImplementedError:
+        pytest.skip(
+            "Restoring cached satellites isn't implemented for {}".format(backend.name)
+        )
+
+    def clear_cache():
+        for name in os.listdir(cache.directory):
+            os.remove(os.path.join(cache.directory, name))
+
+    def startup():
+        return backend.restore(cache.load(parse_catalog(text), WGS72))
+
+    satellites = benchmark.pedantic(
+        startup, setup=clear_cache if cache_state == "cold" else None, rounds=5
+    )
+
+    built = backend.pack(backend.build(catalog_tles(parse_catalog(text))))
+    times = backend.times([epoch])
+    _, expected_r, expected_v = backend.propagate_many(built, *times)
+    e, r, v = backend.propagate_many(satellites, *times)
+
+    if e is not None:
+        assert_allclose(e, 0)
+    assert r.shape == (size, 1, 3)
+    assert_allclose(r, expected_r, rtol=backend.rtol)
+    assert_allclose(v, expected_v, rtol=backend.rtol)
+
+
+def test_satrec_cache_path(catalog_data, tmp_path, monkeypatch):
+    text, _, _ = catalog_data
+    catalog = parse_catalog(text)
+    cache = SatrecCache(str(tmp_path))
+    path = cache.path(catalog, WGS72)
+
+    assert cache.path(parse_catalog(text), WGS72) == path
+    assert cache.path(catalog, WGS84) != path
+    assert cache.path(catalog[:-1], WGS72) != path
+    monkeypatch.setattr(sgp4, "__version__", "0.0")
+    assert cache.path(catalog, WGS72) != path
+
+
+# Fractions of the catalog with new element sets in a daily update
+CHURNS = {"1%": 0.01, "10%": 0.1, "30%": 0.3}
+
+
+def update_catalog(tles, churn, seed=42):
+    """New element sets, one day later, for a ``churn`` fraction of ``tles``."""
+    rng = np.random.default_rng(seed)
+    updated = list(tles)
+    for index in rng.choice(len(tles), size=round(churn * len(tles)), replace=False):
+        line1, line2 = tles[index]
+        # The satellite moved on by a day of revolutions
+        epoch = "{:14.8f}".format(float(line1[18:32]) + 1.0)
+        mo = float(line2[43:51]) + float(line2[52:63]) % 1 * 360
+        line1 = line1[:18] + epoch + line1[32:68]
+        line2 = line2[:43] + "{:8.4f}".format(mo % 360) + line2[51:68]
+        updated[index] = (line1 + str(checksum(line1)), line2 + str(checksum(line2)))
+
+    return updated
+
+
+@pytest.mark.parametrize("max_bytes", [2 ** 30, 2 ** 16], ids=["unbounded", "64KiB"])
+def test_multiple_satellites_catalog_update_cache(
+    backend, max_bytes, multiple_satellites_multiple_dates_large_catalog_update_data
+):
+    tles, start, step, _ = multiple_satellites_multiple_dates_large_catalog_update_data
+    tles, count = tles[:300], 10
+    updated = update_catalog(tles, 0.1)
+    cache = EphemerisCache(backend, max_bytes)
+
+    cache.propagate(tles, start, step, count)
+    e, r, v = cache.propagate(updated, start, step, count)
+
+    expected_e, expected_r, expected_v = backend.propagate_grid(
+        backend.pack(backend.build(updated)), *backend.grid_times(start, step, count)
+    )
+    if e is not None:
+        assert_array_equal(e, expected_e)
+    assert_allclose(r, expected_r, rtol=backend.rtol)
+    assert_allclose(v, expected_v, rtol=backend.rtol)
+    assert cache.nbytes <= max_bytes
+    if max_bytes == 2 ** 30:
+        # Only the new element sets were propagated again
+        assert cache.misses == len(tles) + 30
+        assert len(cache) == len(tles) + 30
+    else:
+        assert len(cache) < len(tles)
+
+
+@pytest.mark.parametrize("update", ["full"] + list(CHURNS))
+def test_multiple_satellites_multiple_dates_large_catalog_update(
+    backend,
+    update,
+    multiple_satellites_multiple_dates_large_catalog_update_data,
+    benchmark,
+):
+    (
+        tles,
+        start,
+        step,
+        count,
+    ) = multiple_satellites_multiple_dates_large_catalog_update_data
+    updated = update_catalog(tles, CHURNS.get(update, 0.1))
+
+    if update == "full":
+        # Rebuild and propagate every satellite
+        def propagate_update():
+            return backend.propagate_grid(
+                backend.pack(backend.build(updated)),
+                *backend.grid_times(start, step, count)
+            )
+
+        e, r, v = benchmark.pedantic(propagate_update, rounds=3)
+    else:
+
+        def warm_cache():
+            cache = EphemerisCache(backend, max_bytes=2 ** 28)
+            cache.propagate(tles, start, step, count)
+            return (cache,), {}
+
+        e, r, v = benchmark.pedantic(
+            lambda cache: cache.propagate(updated, start, step, count),
+            setup=warm_cache,
+            rounds=3,
+        )
+
+    if e is not None:
+        assert_allclose(e, 0)
+    assert r.shape == (len(tles), count, 3)
@@ -0,0 +1,133 @@
+import math
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+from sgp4.model import Satrec, SatrecArray, WGS72
+
+from catalog import CATALOG_DTYPE, catalog_tles, checksum, init_satrecs, parse_catalog
+from epochs import jday_from_epochs
+
+TLE = (
+    "1 41557U 16033B   20345.20030338  .00003290  00000-0  12071-3 0  9996",
+    "2 41557  97.3998  74.3002 0013100 179.2679 265.4184 15.28602096252616",
+)
+
+
+def test_parse_catalog(catalog_data, benchmark):
+    text, size, _ = catalog_data
+
+    catalog = benchmark(parse_catalog, text)
+
+    assert len(catalog) == size
+    assert_array_equal(catalog.satnum, np.arange(1, size + 1))
+    assert catalog.name[-1] == "SAT {}".format(size).encode()
+
+    satrec = Satrec.twoline2rv(*catalog_tles(catalog[-1:])[0], WGS72)
+    assert catalog.epochyr[-1] == satrec.epochyr
+    assert_allclose(
+        [
+            catalog.epochdays[-1],
+            catalog.bstar[-1],
+            catalog.ecco[-1],
+            catalog.inclo[-1],
+            catalog.mo[-1],
+            catalog.no_kozai[-1],
+        ],
+        [
+            satrec.epochdays,
+            satrec.bstar,
+            satrec.ecco,
+            math.degrees(satrec.inclo),
+            math.degrees(satrec.mo),
+            satrec.no_kozai * 1440 / (2 * math.pi),
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "names",
+    [["", ""], ["0 SAT A", "SAT B"], ["", "0 SAT B"], ["SAT A", ""]],
+    ids=["2le", "3le", "2le-3le", "3le-2le"],
+)
+def test_parse_catalog_names(names):
+    text = "".join(
+        "".join(line + "\n" for line in ([name] if name else []) + list(TLE))
+        for name in names
+    )
+
+    catalog = parse_catalog(text)
+
+    assert_array_equal(
+        catalog.name, [name.replace("0 ", "", 1).encode() for name in names]
+    )
+    assert_array_equal(catalog.satnum, [41557, 41557])
+    assert catalog_tles(catalog) == [TLE, TLE]
+
+
+def with_satnum(tle, satnum):
+    # The TLE with another satellite number, and valid checksums
+    lines = [line[:2] + satnum + line[7:68] for line in tle]
+    return tuple(line + str(checksum(line)) for line in lines)
+
+
+def test_parse_catalog_alpha5():
+    tles = [with_satnum(TLE, satnum) for satnum in ["A0001", "J1234", "Z9999"]]
+    text = "\n".join(line for tle in tles for line in tle)
+
+    catalog = parse_catalog(text)
+
+    assert_array_equal(catalog.satnum, [100001, 181234, 339999])
+    assert_array_equal(
+        catalog.satnum, [Satrec.twoline2rv(*tle, WGS72).satnum for tle in tles]
+    )
+
+
+def test_parse_catalog_invalid_checksum():
+    line1, line2 = TLE
+    invalid = line2[:68] + str((int(line2[68]) + 1) % 10)
+    text = "\n".join([line1, line2, line1, invalid, line1, line2])
+
+    with pytest.raises(ValueError) as excinfo:
+        parse_catalog(text)
+    assert str(excinfo.value) == "Invalid checksum in TLEs [1]"
+
+
+def test_parse_catalog_empty():
+    for text in ["", "\n\n"]:
+        catalog = parse_catalog(text)
+
+        assert len(catalog) == 0
+        assert catalog.dtype == CATALOG_DTYPE
+        assert catalog_tles(catalog) == []
+
+
+def test_init_satrecs(multiple_satellites_multiple_dates_large_mixed_data):
+    tles, epochs = multiple_satellites_multiple_dates_large_mixed_data
+    catalog = parse_catalog("\n".join(line for tle in tles for line in tle))
+    jd, fr = jday_from_epochs(epochs[::10])
+
+    satrecs = init_satrecs(catalog, Satrec, WGS72)
+
+    expected = [Satrec.twoline2rv(*tle, WGS72) for tle in tles]
+    expected_e, expected_rs, expected_vs = SatrecArray(expected).sgp4(jd, fr)
+    e, r, v = SatrecArray(satrecs).sgp4(jd, fr)
+
+    assert [satrec.satnum for satrec in satrecs] == [s.satnum for s in expected]
+    # twoline2rv rounds the epoch through a calendar date
+    assert_array_equal(e, expected_e)
+    assert_allclose(r, expected_rs, rtol=1e-7)
+    assert_allclose(v, expected_vs, rtol=1e-7)
+
+
+def test_catalog_ingestion(backend, catalog_data, benchmark):
+    text, size, epoch = catalog_data
+
+    def ingest():
+        return backend.pack(backend.build_catalog(parse_catalog(text)))
+
+    satellites = benchmark(ingest)
+
+    e, r, v = backend.propagate_many(satellites, *backend.times([epoch]))
+    assert r.shape == (size, 1, 3)
+    assert v.shape == (size, 1, 3)
@@ -0,0 +1,34 @@
+import os
+import shutil
+
+import pytest
+
+from coldstart import measure_cold_start
+
+
+@pytest.mark.parametrize("numba_cache", ["cold", "warm"])
+def test_cold_start(backend, numba_cache, tmp_path, benchmark):
+    if numba_cache == "warm" and not backend.jit_cached:
+        pytest.skip("{} doesn't cache its compiled code".format(backend.name))
+
+    cache_dir = str(tmp_path / "numba")
+    env = dict(os.environ, NUMBA_CACHE_DIR=cache_dir)
+    if numba_cache == "warm":
+        measure_cold_start(backend.name, env)
+
+    def clear_cache():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    results = []
+
+    def cold_start():
+        results.append(measure_cold_start(backend.name, env))
+
+    benchmark.pedantic(
+        cold_start, setup=clear_cache if numba_cache == "cold" else None, rounds=5
+    )
+
+    # Best of every latency, like the timings
+    benchmark.extra_info.update(
+        {key: min(result[key] for result in results) for key in results[0]}
+    )
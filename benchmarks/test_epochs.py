@@ -0,0 +1,52 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+import pytest
+
+from epochs import jday_from_datetime64, jday_from_epochs, jday_from_grid
+
+
+def test_jday_from_datetime64_matches_jday(
+    single_satellite_multiple_dates_data_medium,
+):
+    _, epochs, _, _ = single_satellite_multiple_dates_data_medium
+    expected_jd, expected_fr = jday_from_epochs(epochs)
+
+    jd, fr = jday_from_datetime64(np.array(epochs, dtype="datetime64[us]"))
+
+    assert_array_equal(jd, expected_jd)
+    assert_array_equal(fr, expected_fr)
+
+
+@pytest.mark.parametrize("converter", ["jday_loop", "datetime64"])
+def test_jday_multiple_dates_large(
+    converter, single_satellite_multiple_dates_data_large, benchmark
+):
+    _, epochs, _ = single_satellite_multiple_dates_data_large
+    expected_jd, expected_fr = jday_from_epochs(epochs)
+
+    if converter == "jday_loop":
+        jd, fr = benchmark(jday_from_epochs, epochs)
+    else:
+        datetimes = np.array(epochs, dtype="datetime64[us]")
+        jd, fr = benchmark(jday_from_datetime64, datetimes)
+
+    assert_array_equal(jd, expected_jd)
+    assert_array_equal(fr, expected_fr)
+
+
+@pytest.mark.parametrize("converter", ["jday_loop", "datetime64", "grid"])
+def test_jday_regular_grid_large(converter, regular_grid_large, benchmark):
+    start, step, count = regular_grid_large
+    epochs = [start + step * ii for ii in range(count)]
+    expected_jd, expected_fr = jday_from_epochs(epochs)
+
+    if converter == "jday_loop":
+        jd, fr = benchmark(jday_from_epochs, epochs)
+    elif converter == "datetime64":
+        datetimes = np.array(epochs, dtype="datetime64[us]")
+        jd, fr = benchmark(jday_from_datetime64, datetimes)
+    else:
+        jd, fr = benchmark(jday_from_grid, start, step, count)
+
+    assert_array_equal(jd, expected_jd)
+    assert_array_equal(fr, expected_fr)
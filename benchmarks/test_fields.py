@@ -0,0 +1,61 @@
+from numpy.testing import assert_allclose
+import pytest
+
+# Outputs computed besides the errors: positions, velocities or both
+FIELDS = {"rv": ("r", "v"), "r": ("r",), "v": ("v",)}
+
+
+def skip_unselectable(backend, fields):
+    if fields != FIELDS["rv"] and not backend.selects_fields:
+        pytest.skip("{} always computes r and v".format(backend.name))
+
+
+@pytest.mark.parametrize("fields", list(FIELDS.values()), ids=list(FIELDS))
+def test_multiple_satellites_multiple_dates_medium_fields(
+    backend, fields, multiple_satellites_multiple_dates_data_medium, benchmark
+):
+    (
+        tles,
+        epochs,
+        expected_rs,
+        expected_vs,
+    ) = multiple_satellites_multiple_dates_data_medium
+    skip_unselectable(backend, fields)
+
+    satellites = backend.build(tles)
+    args = backend.prepare_many(satellites, epochs)
+
+    e, r, v = benchmark(backend.propagate_many, *args, fields=fields)
+    backend.teardown(args)
+
+    if e is not None:
+        assert_allclose(e, 0)
+    if "r" in fields:
+        assert_allclose(r, expected_rs, rtol=backend.rtol)
+    else:
+        assert r is None
+    if "v" in fields:
+        assert_allclose(v, expected_vs, rtol=backend.rtol)
+    else:
+        assert v is None
+
+
+@pytest.mark.parametrize("fields", list(FIELDS.values()), ids=list(FIELDS))
+def test_multiple_satellites_multiple_dates_large_fields(
+    backend, fields, multiple_satellites_multiple_dates_data_large, benchmark
+):
+    tles, epochs, expected_shape = multiple_satellites_multiple_dates_data_large
+    skip_unselectable(backend, fields)
+
+    satellites = backend.build(tles)
+    args = backend.prepare_many(satellites, epochs)
+
+    e, r, v = benchmark(backend.propagate_many, *args, fields=fields)
+    backend.teardown(args)
+
+    if e is not None:
+        assert_allclose(e, 0)
+    for name, state in (("r", r), ("v", v)):
+        assert (state is None) == (name not in fields)
+        if state is not None:
+            assert state.shape == expected_shape
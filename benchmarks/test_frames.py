@@ -0,0 +1,61 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+from sgp4.propagation import gstime
+
+from epochs import jday_from_grid
+from frames import ecef_to_geodetic, geodetic_to_ecef, gmst, teme_to_ecef
+
+
+def test_gmst_matches_gstime(regular_grid_large):
+    jd, fr = jday_from_grid(*regular_grid_large)
+
+    expected = [gstime(jd_ + fr_) for jd_, fr_ in zip(jd, fr)]
+
+    assert_allclose(gmst(jd, fr), expected, rtol=0, atol=1e-8)
+
+
+def test_geodetic_round_trip():
+    rng = np.random.default_rng(42)
+    latitude = rng.uniform(-np.pi / 2, np.pi / 2, 10_000)
+    longitude = rng.uniform(-np.pi, np.pi, 10_000)
+    altitude = rng.uniform(-10.0, 40_000.0, 10_000)
+
+    result = ecef_to_geodetic(geodetic_to_ecef(latitude, longitude, altitude))
+
+    assert_allclose(result[0], latitude, rtol=0, atol=1e-12)
+    assert_allclose(result[1], longitude, rtol=0, atol=1e-12)
+    assert_allclose(result[2], altitude, rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize("frame", ["teme", "ecef", "geodetic"])
+def test_multiple_satellites_regular_grid_frames(
+    backend, frame, multiple_satellites_regular_grid_data, benchmark
+):
+    tles, start, step, count = multiple_satellites_regular_grid_data
+    args = backend.prepare_grid(backend.build(tles), start, step, count)
+    jd, fr = jday_from_grid(start, step, count)
+
+    def propagate_and_transform():
+        e, r, v = backend.propagate_grid(*args)
+        if frame == "teme":
+            return r
+        r, v = teme_to_ecef(np.asarray(r), np.asarray(v), jd, fr)
+        if frame == "ecef":
+            return r
+        return ecef_to_geodetic(r)
+
+    result = benchmark(propagate_and_transform)
+    backend.teardown(args)
+
+    if frame == "geodetic":
+        latitude, longitude, altitude = result
+        assert latitude.shape == (len(tles), count)
+        assert np.all((altitude > 300) & (altitude < 600))
+    else:
+        assert np.shape(result) == (len(tles), count, 3)
+
+    if benchmark.stats is not None:
+        benchmark.extra_info["propagations_per_second"] = (
+            len(tles) * count / benchmark.stats.stats.min
+        )
@@ -0,0 +1,32 @@
+from numpy.testing import assert_allclose
+import pytest
+
+
+@pytest.mark.parametrize("times", ["epochs", "grid"])
+def test_multiple_satellites_regular_grid(
+    backend, times, multiple_satellites_regular_grid_data, benchmark
+):
+    tles, start, step, count = multiple_satellites_regular_grid_data
+    epochs = [start + step * ii for ii in range(count)]
+    satellites = backend.pack(backend.build(tles))
+
+    # The conversion of the dates runs under the timer,
+    # to compare the arrays of the epochs with the grid computed on the fly
+    if times == "epochs":
+        e, r, v = benchmark(
+            lambda: backend.propagate_many(satellites, *backend.times(epochs))
+        )
+    else:
+        e, r, v = benchmark(
+            lambda: backend.propagate_grid(
+                satellites, *backend.grid_times(start, step, count)
+            )
+        )
+
+    _, expected_r, expected_v = backend.propagate_many(
+        *backend.prepare_many(backend.build(tles), epochs)
+    )
+    if e is not None:
+        assert_allclose(e, 0)
+    assert_allclose(r, expected_r, rtol=backend.rtol)
+    assert_allclose(v, expected_v, rtol=backend.rtol)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from history import BASELINE_RUNS, SIGNIFICANCE, compare_run, store_run
+
+ENVIRONMENT = {"node": "test", "cpu": "test CPU"}
+
+
+def store_runs(path, medians, rounds=20, seed=0):
+    # One run per median, with 1 % of noise in the timings of its rounds
+    rng = np.random.default_rng(seed)
+    for median in medians:
+        times = median * rng.normal(1.0, 0.01, rounds)
+        store_run(path, [("test_name", "name", None, times)], ENVIRONMENT)
+
+
+@pytest.fixture
+def history_path(tmp_path):
+    return str(tmp_path / "history.sqlite")
+
+
+def test_compare_run_flags_regression(history_path):
+    store_runs(history_path, [1.0] * BASELINE_RUNS + [1.2])
+
+    (comparison,) = compare_run(history_path)
+
+    assert comparison["regression"]
+    assert comparison["p_value"] < 1e-6
+    assert comparison["change"] == pytest.approx(0.2, abs=0.01)
+
+
+def test_compare_run_within_noise(history_path):
+    store_runs(history_path, [1.0] * (BASELINE_RUNS + 1))
+
+    (comparison,) = compare_run(history_path)
+
+    assert not comparison["regression"]
+    assert comparison["p_value"] > SIGNIFICANCE
+
+
+def test_compare_run_needs_rounds(history_path):
+    # A single round can't be tested, however slow it is
+    store_runs(history_path, [1.0] * BASELINE_RUNS)
+    store_runs(history_path, [1.2], rounds=1)
+
+    (comparison,) = compare_run(history_path)
+
+    assert comparison["p_value"] is None
+    assert not comparison["regression"]
+    assert comparison["change"] == pytest.approx(0.2, abs=0.03)
+
+
+def test_compare_run_baseline_window(history_path):
+    # The slow runs before the window don't hide the regression
+    store_runs(history_path, [2.0, 2.0] + [1.0] * BASELINE_RUNS + [1.2])
+
+    (comparison,) = compare_run(history_path)
+
+    assert len(comparison["history"]) == BASELINE_RUNS
+    assert max(comparison["history"]) < 1.1
+    assert comparison["regression"]
+
+
+def test_compare_run_first_run(history_path):
+    store_runs(history_path, [1.0])
+
+    (comparison,) = compare_run(history_path)
+
+    assert comparison["history"] == []
+    assert comparison["baseline"] is None
+    assert not comparison["regression"]
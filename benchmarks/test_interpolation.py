@@ -0,0 +1,64 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from interpolation import propagate_interpolated
+from scaling import min_time
+
+# Dates of the grid per propagated node, and largest expected position error (km)
+STRIDES = {30: 1e-3, 60: 1e-3, 120: 1e-2, 300: 0.5}
+
+
+@pytest.fixture
+def direct_propagation(backend, single_satellite_dense_grid_data):
+    # The arguments of the direct propagation to every date, and its states
+    tle, start, step, count = single_satellite_dense_grid_data
+    (satellite,) = backend.build([tle])
+    epochs = [start + step * ii for ii in range(count)]
+    args = backend.prepare_array(satellite, epochs)
+
+    e, r, v = backend.propagate_array(*args)
+    if e is not None:
+        assert_allclose(e, 0)
+    yield args, np.asarray(r), np.asarray(v)
+
+    backend.teardown(args)
+
+
+@pytest.mark.parametrize(
+    "stride",
+    [None, *STRIDES],
+    ids=["direct", *("every_{}".format(stride) for stride in STRIDES)],
+)
+def test_single_satellite_dense_grid(
+    backend, stride, single_satellite_dense_grid_data, benchmark, direct_propagation
+):
+    tle, start, step, count = single_satellite_dense_grid_data
+    direct_args, expected_r, expected_v = direct_propagation
+
+    if stride is None:
+        e, r, v = benchmark(backend.propagate_array, *direct_args)
+
+        if e is not None:
+            assert_allclose(e, 0)
+        assert_allclose(r, expected_r)
+        assert_allclose(v, expected_v)
+        return
+
+    (satellite,) = backend.build([tle])
+    satellites = backend.pack([satellite])
+    e, r, v = benchmark(
+        propagate_interpolated, backend, satellites, start, step, count, stride
+    )
+
+    if e is not None:
+        assert_allclose(e, 0)
+    position_error = np.linalg.norm(r[0] - expected_r, axis=-1).max()
+    velocity_error = np.linalg.norm(v[0] - expected_v, axis=-1).max()
+    assert position_error < STRIDES[stride]
+
+    benchmark.extra_info["max_position_error_km"] = position_error
+    benchmark.extra_info["max_velocity_error_km_s"] = velocity_error
+    if benchmark.stats is not None:
+        direct_elapsed = min_time(backend.propagate_array, *direct_args)
+        benchmark.extra_info["speedup"] = direct_elapsed / benchmark.stats.stats.min
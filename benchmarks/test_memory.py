@@ -0,0 +1,27 @@
+import tracemalloc
+
+import numpy as np
+
+from memory import measure_memory
+
+
+def test_measure_memory():
+    result, memory = measure_memory(np.ones, 2 ** 20)
+
+    assert result.shape == (2 ** 20,)
+    assert memory["tracemalloc_peak"] >= result.nbytes
+    assert memory["retained_blocks"] >= 1
+    assert not tracemalloc.is_tracing()
+
+
+def test_benchmark_returns_timed_result(benchmark):
+    traced = []
+
+    def function():
+        traced.append(tracemalloc.is_tracing())
+        return len(traced) - 1
+
+    call = benchmark.pedantic(function, rounds=2)
+
+    # A timed round, not the extra call under tracemalloc
+    assert not traced[call]
@@ -0,0 +1,29 @@
+from numpy.testing import assert_array_equal
+import pytest
+from sgp4.model import Satrec, SatrecArray, WGS72
+
+from broadcast import SatelliteArrays
+from epochs import jday_from_epochs
+
+parallel = pytest.importorskip("parallel")
+
+
+def test_sgp4_parallel_errors_only(
+    multiple_satellites_multiple_dates_large_mixed_data,
+):
+    tles, epochs = multiple_satellites_multiple_dates_large_mixed_data
+    satrecs = [Satrec.twoline2rv(*tle, WGS72) for tle in tles]
+    satrecs = [satrec for satrec in satrecs if satrec.method == "n"]
+    jd, fr = jday_from_epochs(epochs[::10])
+    expected_e, _, _ = SatrecArray(satrecs).sgp4(jd, fr)
+    elements = parallel.elements(SatelliteArrays.from_satrecs(satrecs))
+
+    e, r, v = parallel.sgp4_parallel(elements, jd, fr, fields=())
+    grid_e, _, _ = parallel.sgp4_parallel_grid(
+        elements, jd[0], fr[0], 0.0, 3, fields=()
+    )
+
+    assert r is None and v is None
+    assert (expected_e != 0).any()
+    assert_array_equal(e, expected_e)
+    assert_array_equal(grid_e, expected_e[:, :1].repeat(3, axis=1))
@@ -0,0 +1,52 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+
+from passes import predict_passes, predict_passes_dense
+
+
+@pytest.mark.parametrize("search", ["dense", "coarse_to_fine"])
+def test_multiple_satellites_multiple_dates_large_passes(
+    backend,
+    search,
+    multiple_satellites_multiple_dates_large_passes_data,
+    benchmark,
+):
+    (
+        tles,
+        stations,
+        start,
+        step,
+        count,
+        stride,
+        dense_stride,
+    ) = multiple_satellites_multiple_dates_large_passes_data
+    dense_args = (backend, tles, stations, start, step * dense_stride)
+    dense_kwargs = {"count": (count - 1) // dense_stride + 1}
+
+    if search == "dense":
+        passes = benchmark.pedantic(
+            predict_passes_dense, dense_args, dense_kwargs, rounds=3
+        )
+    else:
+        passes = benchmark.pedantic(
+            predict_passes,
+            (backend, tles, stations, start, step, count, stride),
+            rounds=3,
+        )
+
+    assert len(passes) > 0
+    benchmark.extra_info["passes"] = len(passes)
+    if search == "dense":
+        return
+
+    # Same passes, up to the resolution of the dense propagation,
+    # except those grazing the horizon that either search may miss
+    expected = predict_passes_dense(*dense_args, **dense_kwargs)
+    expected = expected[expected["max_elevation"] > np.radians(1)]
+    passes = passes[passes["max_elevation"] > np.radians(1)]
+    resolution = (step * dense_stride).total_seconds()
+    assert_array_equal(passes["station"], expected["station"])
+    assert_array_equal(passes["satellite"], expected["satellite"])
+    for name in ("rise", "culmination", "set"):
+        assert_allclose(passes[name], expected[name], rtol=0, atol=resolution)
@@ -0,0 +1,81 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from sgp4.model import Satrec, WGS72
+
+from broadcast import SatelliteArrays, sgp4_broadcast
+from epochs import jday_from_epochs
+from scaling import min_time
+
+DTYPES = [np.float64, np.float32]
+
+# Worst errors of single precision against the float64 references
+MAX_POSITION_ERROR = 0.1  # km
+MAX_VELOCITY_ERROR = 1e-4  # km/s
+
+
+def record_precision(benchmark, dtype, r, v, *args):
+    # The speedup over float64 propagating the same sgp4_broadcast ``args``
+    benchmark.extra_info["dtype"] = np.dtype(dtype).name
+    benchmark.extra_info["result_bytes"] = r.nbytes + v.nbytes
+    if benchmark.stats is None:  # --benchmark-disable
+        return
+
+    elapsed = benchmark.stats.stats.min
+    if dtype is not np.float64:
+        float64_elapsed = min_time(lambda: sgp4_broadcast(*args, dtype=np.float64))
+    else:
+        float64_elapsed = elapsed
+    benchmark.extra_info["speedup"] = float64_elapsed / elapsed
+
+
+@pytest.mark.parametrize("dtype", DTYPES, ids=lambda dtype: np.dtype(dtype).name)
+def test_multiple_satellites_multiple_dates_medium_precision(
+    dtype, multiple_satellites_multiple_dates_data_medium, benchmark
+):
+    (
+        tles,
+        epochs,
+        expected_rs,
+        expected_vs,
+    ) = multiple_satellites_multiple_dates_data_medium
+    jd, fr = jday_from_epochs(epochs)
+    satellites = SatelliteArrays.from_satrecs(
+        [Satrec.twoline2rv(*tle, WGS72) for tle in tles]
+    )
+
+    e, r, v = benchmark(sgp4_broadcast, satellites, jd, fr, dtype=dtype)
+
+    position_error = np.abs(r - expected_rs).max()
+    velocity_error = np.abs(v - expected_vs).max()
+    benchmark.extra_info["max_position_error_km"] = float(position_error)
+    benchmark.extra_info["max_velocity_error_km_s"] = float(velocity_error)
+    record_precision(benchmark, dtype, r, v, satellites, jd, fr)
+
+    assert_allclose(e, 0)
+    assert r.dtype == v.dtype == dtype
+    if dtype is np.float64:
+        assert_allclose(r, expected_rs)
+        assert_allclose(v, expected_vs)
+    else:
+        assert position_error < MAX_POSITION_ERROR
+        assert velocity_error < MAX_VELOCITY_ERROR
+
+
+@pytest.mark.parametrize("dtype", DTYPES, ids=lambda dtype: np.dtype(dtype).name)
+def test_multiple_satellites_multiple_dates_large_precision(
+    dtype, multiple_satellites_multiple_dates_data_large, benchmark
+):
+    tles, epochs, expected_shape = multiple_satellites_multiple_dates_data_large
+    jd, fr = jday_from_epochs(epochs)
+    satellites = SatelliteArrays.from_satrecs(
+        [Satrec.twoline2rv(*tle, WGS72) for tle in tles]
+    )
+
+    e, r, v = benchmark(sgp4_broadcast, satellites, jd, fr, dtype=dtype)
+    record_precision(benchmark, dtype, r, v, satellites, jd, fr)
+
+    assert_allclose(e, 0)
+    assert r.shape == expected_shape
+    assert v.shape == expected_shape
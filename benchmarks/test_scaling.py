@@ -0,0 +1,19 @@
+def test_multiple_satellites_multiple_dates_sweep(
+    backend, multiple_satellites_multiple_dates_data_sweep, benchmark, scaling_records
+):
+    tles, epochs, expected_shape = multiple_satellites_multiple_dates_data_sweep
+
+    satellites = backend.build(tles)
+    args = backend.prepare_many(satellites, epochs)
+
+    e, r, v = benchmark(backend.propagate_many, *args)
+    backend.teardown(args)
+
+    assert r.shape == expected_shape
+    assert v.shape == expected_shape
+
+    if benchmark.stats is not None:
+        n, m, _ = expected_shape
+        elapsed = benchmark.stats.stats.min
+        benchmark.extra_info["propagations_per_second"] = n * m / elapsed
+        scaling_records.append((backend.name, n, m, elapsed))
@@ -0,0 +1,45 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+from screening import close_pairs, screen_conjunctions
+
+
+def test_close_pairs_matches_brute_force():
+    rng = np.random.default_rng(42)
+    positions = rng.uniform(-100.0, 100.0, (2000, 3))
+    positions[7] = np.nan
+
+    i, j, distance = close_pairs(positions, 5.0)
+
+    distances = np.linalg.norm(positions[:, None] - positions[None], axis=-1)
+    expected_i, expected_j = np.nonzero(np.triu(distances < 5.0, 1))
+    order = np.lexsort((j, i))
+    assert_array_equal(i[order], expected_i)
+    assert_array_equal(j[order], expected_j)
+    assert_allclose(distance[order], distances[expected_i, expected_j])
+
+
+def test_multiple_satellites_multiple_dates_large_screening(
+    backend, multiple_satellites_multiple_dates_large_screening_data, benchmark
+):
+    (
+        tles,
+        start,
+        step,
+        count,
+        threshold,
+    ) = multiple_satellites_multiple_dates_large_screening_data
+
+    args = backend.prepare_grid(backend.build(tles), start, step, count)
+
+    def propagate_and_screen():
+        e, r, v = backend.propagate_grid(*args)
+        return screen_conjunctions(np.asarray(r), threshold)
+
+    dates, i, j, distance = benchmark(propagate_and_screen)
+    backend.teardown(args)
+
+    assert len(dates) > 0
+    assert np.all(i < j)
+    assert np.all(distance < threshold)
+    benchmark.extra_info["conjunctions"] = len(dates)
@@ -0,0 +1,119 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+import pytest
+from sgp4.api import Satrec, SatrecArray
+
+from epochs import jday_from_epochs
+
+from scaling import min_time, record_strong_scaling
+from sharding import ShardedPropagator, StealingPropagator, worker_counts
+
+
+def single_worker_time(backend, tles, epochs):
+    with ShardedPropagator(backend, tles, epochs, 1) as propagator:
+        return min_time(propagator.propagate)
+
+
+@pytest.mark.parametrize("workers", worker_counts())
+def test_multiple_satellites_multiple_dates_medium_sharded(
+    backend,
+    workers,
+    multiple_satellites_multiple_dates_data_medium,
+    benchmark,
+):
+    (
+        tles,
+        epochs,
+        expected_rs,
+        expected_vs,
+    ) = multiple_satellites_multiple_dates_data_medium
+
+    with ShardedPropagator(backend, tles, epochs, workers) as propagator:
+        e, r, v = benchmark(propagator.propagate)
+
+        assert (e is None) == (not backend.error_codes)
+        if e is not None:
+            assert_allclose(e, 0)
+        assert_allclose(r, expected_rs, rtol=backend.rtol)
+        assert_allclose(v, expected_vs, rtol=backend.rtol)
+
+    record_strong_scaling(
+        benchmark, workers, lambda: single_worker_time(backend, tles, epochs)
+    )
+
+
+@pytest.mark.parametrize("workers", worker_counts())
+def test_multiple_satellites_multiple_dates_large_sharded(
+    backend,
+    workers,
+    multiple_satellites_multiple_dates_data_large,
+    benchmark,
+):
+    tles, epochs, expected_shape = multiple_satellites_multiple_dates_data_large
+
+    with ShardedPropagator(backend, tles, epochs, workers) as propagator:
+        e, r, v = benchmark(propagator.propagate)
+
+        if e is not None:
+            assert_allclose(e, 0)
+        assert r.shape == expected_shape
+        assert v.shape == expected_shape
+
+    record_strong_scaling(
+        benchmark, workers, lambda: single_worker_time(backend, tles, epochs)
+    )
+
+
+def test_multiple_satellites_multiple_dates_medium_stealing(
+    backend, multiple_satellites_multiple_dates_data_medium
+):
+    (
+        tles,
+        epochs,
+        expected_rs,
+        expected_vs,
+    ) = multiple_satellites_multiple_dates_data_medium
+
+    with StealingPropagator(backend, tles, epochs, 2, task_size=8) as propagator:
+        e, r, v = propagator.propagate()
+
+        if e is not None:
+            assert_allclose(e, 0)
+        assert_allclose(r, expected_rs, rtol=backend.rtol)
+        assert_allclose(v, expected_vs, rtol=backend.rtol)
+
+
+@pytest.mark.parametrize("workers", worker_counts())
+@pytest.mark.parametrize("scheduling", ["static", "stealing"])
+def test_multiple_satellites_multiple_dates_large_mixed_sharded(
+    backend,
+    scheduling,
+    workers,
+    multiple_satellites_multiple_dates_large_mixed_data,
+    benchmark,
+):
+    tles, epochs = multiple_satellites_multiple_dates_large_mixed_data
+    if not backend.deep_space:
+        # Only the near earth part of the catalog, still with decaying orbits
+        tles = [tle for tle in tles if Satrec.twoline2rv(*tle).method == "n"]
+    # Satellites failing at the last date, from the reference implementation
+    e, _, _ = SatrecArray([Satrec.twoline2rv(*tle) for tle in tles]).sgp4(
+        *jday_from_epochs(epochs[-1:])
+    )
+    failed = e[:, 0] != 0
+
+    propagator_class = (
+        ShardedPropagator if scheduling == "static" else StealingPropagator
+    )
+    with propagator_class(backend, tles, epochs, workers) as propagator:
+        e, r, v = benchmark(propagator.propagate)
+
+        assert r.shape == v.shape == (len(tles), len(epochs), 3)
+        assert_array_equal(np.isnan(r[:, -1]).any(axis=-1), failed)
+        assert_array_equal(np.isnan(v[:, -1]).any(axis=-1), failed)
+        if scheduling == "stealing":
+            benchmark.extra_info["steals"] = sum(propagator.steals)
+            # Longest busy time of a worker relative to the average
+            benchmark.extra_info["imbalance"] = max(propagator.busy) / np.mean(
+                propagator.busy
+            )
@@ -0,0 +1,63 @@
+import numpy as np
+from numpy.testing import assert_allclose
+import pytest
+
+from streaming import propagate_tiles
+
+TILE_SHAPES = [(10, 101), (100, 101), (100, 1010), (1000, 1010), (1000, 10_100)]
+
+
+def consume(tiles):
+    errors = 0
+    for _, (e, r, v) in tiles:
+        if e is not None:
+            errors += np.count_nonzero(e)
+
+    return errors
+
+
+def test_multiple_satellites_multiple_dates_medium_streaming(
+    backend, multiple_satellites_multiple_dates_data_medium
+):
+    (
+        tles,
+        epochs,
+        expected_rs,
+        expected_vs,
+    ) = multiple_satellites_multiple_dates_data_medium
+    satellites = backend.build(tles)
+
+    r = np.full(expected_rs.shape, np.nan)
+    v = np.full(expected_vs.shape, np.nan)
+    for (satellites_slice, epochs_slice), (e_tile, r_tile, v_tile) in propagate_tiles(
+        backend, satellites, epochs, (7, 10)
+    ):
+        if e_tile is not None:
+            assert_allclose(e_tile, 0)
+        r[satellites_slice, epochs_slice] = r_tile
+        v[satellites_slice, epochs_slice] = v_tile
+
+    assert_allclose(r, expected_rs, rtol=backend.rtol)
+    assert_allclose(v, expected_vs, rtol=backend.rtol)
+
+
+@pytest.mark.parametrize(
+    "tile_shape", TILE_SHAPES, ids=["{}x{}".format(*shape) for shape in TILE_SHAPES]
+)
+def test_multiple_satellites_multiple_dates_large_streaming(
+    backend, tile_shape, multiple_satellites_multiple_dates_data_large, benchmark
+):
+    tles, epochs, expected_shape = multiple_satellites_multiple_dates_data_large
+    satellites = backend.build(tles)
+
+    errors = benchmark(
+        lambda: consume(propagate_tiles(backend, satellites, epochs, tile_shape))
+    )
+
+    assert errors == 0
+    n, m, _ = expected_shape
+    benchmark.extra_info["tile_bytes"] = tile_shape[0] * tile_shape[1] * 2 * 3 * 8
+    if benchmark.stats is not None:
+        benchmark.extra_info["propagations_per_second"] = (
+            n * m / benchmark.stats.stats.min
+        )
@@ -0,0 +1,81 @@
+from numpy.testing import assert_allclose
+import pytest
+
+from scaling import min_time, record_strong_scaling
+from sharding import worker_counts
+
+
+@pytest.fixture(params=worker_counts())
+def threads(backend, request):
+    try:
+        backend.set_threads(request.param)
+    except NotImplementedError:
+        pytest.skip("{} is not multithreaded".format(backend.name))
+
+    yield request.param
+    backend.set_threads(None)
+
+
+def single_thread_time(backend, threads, args):
+    backend.set_threads(1)
+    try:
+        return min_time(backend.propagate_many, *args)
+    finally:
+        backend.set_threads(threads)
+
+
+def test_multiple_satellites_multiple_dates_medium_threads(
+    backend,
+    threads,
+    multiple_satellites_multiple_dates_data_medium,
+    benchmark,
+):
+    (
+        tles,
+        epochs,
+        expected_rs,
+        expected_vs,
+    ) = multiple_satellites_multiple_dates_data_medium
+
+    satellites = backend.build(tles)
+    args = backend.prepare_many(satellites, epochs)
+
+    e, r, v = benchmark(backend.propagate_many, *args)
+    record_strong_scaling(
+        benchmark,
+        threads,
+        lambda: single_thread_time(backend, threads, args),
+        "threads",
+    )
+    backend.teardown(args)
+
+    if e is not None:
+        assert_allclose(e, 0)
+    assert_allclose(r, expected_rs, rtol=backend.rtol)
+    assert_allclose(v, expected_vs, rtol=backend.rtol)
+
+
+def test_multiple_satellites_multiple_dates_large_threads(
+    backend,
+    threads,
+    multiple_satellites_multiple_dates_data_large,
+    benchmark,
+):
+    tles, epochs, expected_shape = multiple_satellites_multiple_dates_data_large
+
+    satellites = backend.build(tles)
+    args = backend.prepare_many(satellites, epochs)
+
+    e, r, v = benchmark(backend.propagate_many, *args)
+    record_strong_scaling(
+        benchmark,
+        threads,
+        lambda: single_thread_time(backend, threads, args),
+        "threads",
+    )
+    backend.teardown(args)
+
+    if e is not None:
+        assert_allclose(e, 0)
+    assert r.shape == expected_shape
+    assert v.shape == expected_shape